@@ -4,20 +4,45 @@ Manages AI model loading, performance tracking, and signal generation
 """
 
 import asyncio
+import hmac
 import json
 import logging
 import pickle
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Union
 import numpy as np
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
 from .config import settings
-from .utils.model_loader import ModelLoader
+from .utils.model_loader import ModelLoader, checksum_many, file_checksum
+from .utils.message_serializer import SignalMessage
 from .utils.signal_validator import SignalValidator
 
+# Row layout of the column-major market data array built by to_market_array
+CLOSE, HIGH, LOW, VOLUME, SPREAD = range(5)
+MARKET_FIELDS = 5
+
+
+def to_market_array(market_data: Union[np.ndarray, List[Dict[str, Any]]]) -> np.ndarray:
+    """Convert candle dicts into a (MARKET_FIELDS, n) float64 array, one contiguous row per field"""
+    if isinstance(market_data, np.ndarray):
+        return market_data
+
+    n = len(market_data)
+    flat = np.fromiter(
+        (value for candle in market_data for value in (
+            candle.get("close", candle.get("price", 0)),
+            candle.get("high", 0),
+            candle.get("low", 0),
+            candle.get("volume", 0),
+            candle.get("spread", 2.0)  # Default spread
+        )),
+        dtype=np.float64, count=n * MARKET_FIELDS
+    )
+    return np.ascontiguousarray(flat.reshape(n, MARKET_FIELDS).T)
+
 
 class Agent:
     """Individual AI agent wrapper"""
@@ -40,6 +65,28 @@ class Agent:
             self.logger.error(f"Failed to load model {self.name}: {e}")
             raise
 
+    def verify_model_integrity(self, expected_checksum: str) -> bool:
+        """Check the model file against its expected BLAKE2b checksum"""
+        try:
+            return hmac.compare_digest(file_checksum(self.model_path), expected_checksum)
+        except OSError as e:
+            self.logger.error(f"Failed to checksum model {self.name}: {e}")
+            return False
+
+    @staticmethod
+    def verify_models_bulk(model_paths: List[str], expected_checksums: List[str],
+                           drop_cache: bool = False) -> List[bool]:
+        """Check many model files at once, hashing them in parallel; unreadable files fail"""
+        if len(model_paths) != len(expected_checksums):
+            raise ValueError(
+                f"Got {len(model_paths)} model paths but {len(expected_checksums)} checksums"
+            )
+        digests = checksum_many(model_paths, drop_cache=drop_cache)
+        return [
+            digests[path] is not None and hmac.compare_digest(digests[path], expected)
+            for path, expected in zip(model_paths, expected_checksums)
+        ]
+
     async def predict(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate prediction"""
         if not self.model:
@@ -89,37 +136,21 @@ class Agent:
     async def _preprocess_technical_data(self, data: Dict[str, Any]) -> np.ndarray:
         """Preprocess technical analysis data"""
         # Extract OHLCV and technical indicators
-        features = []
-        market_data = data.get("market_data", [])
-
-        if len(market_data) >= 60:  # Need at least 60 candles
-            recent_data = market_data[-60:]
+        market = to_market_array(data.get("market_data", []))
 
-            # Basic OHLCV
-            closes = [candle.get("close", candle.get("price", 0)) for candle in recent_data]
-            highs = [candle.get("high", 0) for candle in recent_data]
-            lows = [candle.get("low", 0) for candle in recent_data]
-            volumes = [candle.get("volume", 0) for candle in recent_data]
+        if market.shape[1] < 60:  # Need at least 60 candles
+            return np.empty((1, 0))
 
-            # Calculate technical indicators
-            features.extend(closes)
-            features.extend(highs)
-            features.extend(lows)
-            features.extend(volumes)
+        # Basic OHLCV: rows are already contiguous per field
+        recent = market[:, -60:]
+        closes = recent[CLOSE]
 
-            # RSI (simplified)
-            rsi = self._calculate_rsi(closes)
-            features.append(rsi)
-
-            # MACD (simplified)
-            macd = self._calculate_macd(closes)
-            features.extend(macd)
-
-            # Bollinger Bands (simplified)
-            bb = self._calculate_bollinger_bands(closes)
-            features.extend(bb)
-
-        return np.array(features).reshape(1, -1)
+        return np.concatenate((
+            recent[CLOSE], recent[HIGH], recent[LOW], recent[VOLUME],
+            [self._calculate_rsi(closes)],  # RSI (simplified)
+            self._calculate_macd(closes),  # MACD (simplified)
+            self._calculate_bollinger_bands(closes)  # Bollinger Bands (simplified)
+        )).reshape(1, -1)
 
     async def _preprocess_sentiment_data(self, data: Dict[str, Any]) -> np.ndarray:
         """Preprocess sentiment data"""
@@ -139,28 +170,22 @@ class Agent:
 
     async def _preprocess_price_data(self, data: Dict[str, Any]) -> np.ndarray:
         """Preprocess price prediction data"""
-        market_data = data.get("market_data", [])
+        market = to_market_array(data.get("market_data", []))
 
-        if len(market_data) >= 20:
-            closes = [candle.get("close", candle.get("price", 0)) for candle in market_data[-20:]]
-            features = closes
-        else:
-            features = [0.0] * 20
+        if market.shape[1] >= 20:
+            return market[CLOSE, -20:].reshape(1, -1)
 
-        return np.array(features).reshape(1, -1)
+        return np.zeros((1, 20))
 
     async def _preprocess_risk_data(self, data: Dict[str, Any]) -> np.ndarray:
         """Preprocess risk assessment data"""
-        market_data = data.get("market_data", [])
+        market = to_market_array(data.get("market_data", []))
 
-        if market_data:
-            latest = market_data[-1]
-            price = latest.get("close", latest.get("price", 0))
-            volume = latest.get("volume", 0)
-            spread = latest.get("spread", 2.0)  # Default spread
+        if market.shape[1]:
+            price, _, _, volume, spread = market[:, -1]
 
             # Calculate ATR (simplified)
-            atr = self._calculate_atr(market_data)
+            atr = self._calculate_atr(market)
 
             # Time of day factor
             hour = datetime.now().hour
@@ -208,25 +233,14 @@ class Agent:
             "metadata": {"raw_prediction": str(prediction)}
         }
 
-    def _calculate_rsi(self, prices: List[float], period: int = 14) -> float:
+    def _calculate_rsi(self, prices: Union[np.ndarray, List[float]], period: int = 14) -> float:
         """Calculate RSI"""
         if len(prices) < period + 1:
             return 50.0
 
-        gains = []
-        losses = []
-
-        for i in range(1, len(prices)):
-            change = prices[i] - prices[i-1]
-            if change > 0:
-                gains.append(change)
-                losses.append(0)
-            else:
-                gains.append(0)
-                losses.append(abs(change))
-
-        avg_gain = np.mean(gains[-period:])
-        avg_loss = np.mean(losses[-period:])
+        changes = np.diff(prices[-(period + 1):])
+        avg_gain = np.maximum(changes, 0).mean()
+        avg_loss = np.maximum(-changes, 0).mean()
 
         if avg_loss == 0:
             return 100.0
@@ -262,21 +276,20 @@ class Agent:
 
         return [sma, upper, lower]
 
-    def _calculate_atr(self, market_data: List[Dict[str, Any]], period: int = 14) -> float:
+    def _calculate_atr(self, market_data: Union[np.ndarray, List[Dict[str, Any]]], period: int = 14) -> float:
         """Calculate ATR"""
-        if len(market_data) < period:
+        market = to_market_array(market_data)
+        if market.shape[1] < period:
             return 0.0
 
-        tr_values = []
-        for i in range(1, min(len(market_data), period + 1)):
-            high = market_data[i].get("high", 0)
-            low = market_data[i].get("low", 0)
-            prev_close = market_data[i-1].get("close", market_data[i-1].get("price", 0))
-
-            tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
-            tr_values.append(tr)
+        window = market[:, :period + 1]
+        high, low = window[HIGH, 1:], window[LOW, 1:]
+        prev_close = window[CLOSE, :-1]
+        if not high.size:
+            return 0.0
 
-        return np.mean(tr_values) if tr_values else 0.0
+        tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+        return tr.mean()
 
 
 class AIOrchestrator:
@@ -345,16 +358,22 @@ class AIOrchestrator:
         except Exception as e:
             self.logger.error(f"Failed to load active models: {e}")
 
-    async def get_ensemble_signal(self, symbol: str, market_data: List[Dict[str, Any]],
-                                news_data: List[Dict[str, Any]] = None) -> Dict[str, Any]:
+    async def get_ensemble_signal(self, symbol: str, market_data: Union[np.ndarray, List[Dict[str, Any]]],
+                                news_data: List[Dict[str, Any]] = None) -> SignalMessage:
         """Get aggregated signal from all active agents"""
         if not self.active_agents:
-            return {
-                "action": "HOLD",
-                "confidence": 0.0,
-                "reason": "No active agents available",
-                "votes": {"BUY": 0, "SELL": 0, "HOLD": 0}
-            }
+            return SignalMessage(
+                symbol=symbol,
+                reason="No active agents available",
+                votes={"BUY": 0.0, "SELL": 0.0, "HOLD": 0.0}
+            )
+
+        # Convert candles to columns once, not per agent; malformed candles are
+        # passed through so each agent fails into its own safe HOLD
+        try:
+            market_data = to_market_array(market_data)
+        except (TypeError, ValueError) as e:
+            self.logger.warning(f"Malformed market data for {symbol}: {e}")
 
         # Prepare data for agents
         data = {
@@ -374,15 +393,21 @@ class AIOrchestrator:
                 valid_results.append(result)
 
         if not valid_results:
-            return {
-                "action": "HOLD",
-                "confidence": 0.0,
-                "reason": "No valid agent predictions",
-                "votes": {"BUY": 0, "SELL": 0, "HOLD": 0}
-            }
+            return SignalMessage(
+                symbol=symbol,
+                reason="No valid agent predictions",
+                votes={"BUY": 0.0, "SELL": 0.0, "HOLD": 0.0}
+            )
 
         # Weighted voting based on performance
-        ensemble_result = await self._weighted_vote(valid_results)
+        vote = await self._weighted_vote(valid_results)
+        ensemble_result = SignalMessage(
+            symbol=symbol,
+            action=vote['action'],
+            confidence=float(vote['confidence']),
+            reason=vote['reason'],
+            votes={action: float(weight) for action, weight in vote['votes'].items()}
+        )
 
         # Check confidence threshold
         if ensemble_result['confidence'] < settings.confidence_threshold:
@@ -436,7 +461,7 @@ class AIOrchestrator:
             "votes": votes
         }
 
-    async def _log_signal(self, symbol: str, ensemble_result: Dict[str, Any],
+    async def _log_signal(self, symbol: str, ensemble_result: SignalMessage,
                          agent_results: List[Dict[str, Any]]):
         """Log signal for performance tracking"""
         try:
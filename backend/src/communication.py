@@ -4,18 +4,27 @@ Handles ultra-low latency communication between AI backend and MT4
 """
 
 import asyncio
-import json
 import logging
+import socket
 import time
-from datetime import datetime
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Union
+import msgspec
+import orjson
 import zmq
 import zmq.asyncio
 import websockets
 from websockets.exceptions import ConnectionClosedError
 
 from .config import settings
-from .utils.message_serializer import MessageSerializer
+from .utils.latency_window import LatencyWindow
+from .utils.message_serializer import (
+    CLIENT_JSON_DECODER, CLIENT_MSGPACK_DECODER, MSGPACK_ENCODER, ClientHeartbeat,
+    ClientSignalAck, ClientStatusRequest, CompressedSerializer, MessageSerializer, SignalMessage, iso_now
+)
+
+# Offered WebSocket subprotocols; clients that negotiate none get msgpack.
+# 'msgpack-zstd' batch frames are zstd-compressed once and shared by all such clients.
+WS_SUBPROTOCOLS = ["msgpack", "msgpack-zstd", "json"]
 
 
 class ZMQBridge:
@@ -24,11 +33,23 @@ class ZMQBridge:
     def __init__(self):
         self.context = zmq.asyncio.Context()
         self.publisher = None
+        self._publisher_sync = None
         self.responder = None
         self.running = False
-        self.latency_samples = []
+        self.latency_samples = LatencyWindow(size=100)
+        self.send_latency_samples = LatencyWindow(size=100)
+        self.dropped_signals = 0
+
+        # Reused for every heartbeat reply; fields are overwritten in place
+        self._heartbeat_response = {
+            'status': 'OK',
+            'server_time': 0,
+            'avg_latency_ms': 0.0,
+            'timestamp': ''
+        }
         self.message_serializer = MessageSerializer()
         self.logger = logging.getLogger(__name__)
+        self._info_enabled = self.logger.isEnabledFor(logging.INFO)
 
         # Callbacks
         self.on_signal_request: Optional[Callable] = None
@@ -37,16 +58,28 @@ class ZMQBridge:
     async def start(self):
         """Start ZMQ bridge"""
         self.running = True
+        self._info_enabled = self.logger.isEnabledFor(logging.INFO)
         self.logger.info("Starting ZeroMQ bridge...")
 
         try:
             # Publisher socket for sending signals to MT4
-            self.publisher = self.context.socket(zmq.PUB)
+            # XPUB so XPUB_NODROP can refuse at SNDHWM; a plain PUB drops silently
+            self.publisher = self.context.socket(zmq.XPUB)
+            self.publisher.setsockopt(zmq.XPUB_NODROP, 1)
+            self.publisher.setsockopt(zmq.TCP_KEEPALIVE, 1)
+            self.publisher.setsockopt(zmq.IMMEDIATE, 1)  # Only queue for completed connections
+            self.publisher.setsockopt(zmq.SNDHWM, settings.zmq_send_hwm)
+            self.publisher.setsockopt(zmq.LINGER, 0)
             self.publisher.bind(settings.zmq_signal_address)
+
+            # Blocking-API view of the same socket: DONTWAIT sends complete inline
+            # instead of going through the asyncio Future machinery
+            self._publisher_sync = zmq.Socket.shadow(self.publisher.underlying)
             self.logger.info(f"Publisher bound to {settings.zmq_signal_address}")
 
             # Responder socket for MT4 heartbeat/status
             self.responder = self.context.socket(zmq.REP)
+            self.responder.setsockopt(zmq.TCP_KEEPALIVE, 1)
             self.responder.bind(settings.zmq_heartbeat_address)
             self.logger.info(f"Responder bound to {settings.zmq_heartbeat_address}")
 
@@ -69,27 +102,38 @@ class ZMQBridge:
         self.context.term()
         self.logger.info("ZMQ bridge stopped")
 
-    async def send_signal(self, signal: Dict[str, Any]) -> bool:
-        """Send trading signal to MT4"""
+    async def send_signal(self, signal: Union[SignalMessage, Dict[str, Any]]) -> bool:
+        """Send trading signal to MT4 (signal must carry action, symbol and confidence)"""
         if not self.publisher or not self.running:
             return False
 
         try:
-            # Add timestamp for latency tracking
+            # Wall-clock timestamp so MT4 can compare against its own clock
             signal['server_timestamp'] = time.time_ns()
+            send_start = time.perf_counter_ns()
 
             # Serialize message
             message = self.message_serializer.serialize_signal(signal)
 
-            # Send via PUB socket
-            await self.publisher.send(message)
+            # Send via PUB socket without ever blocking the event loop. Signals are a
+            # few hundred bytes, well under zmq.COPY_THRESHOLD: a plain copying send
+            # is cheaper than building a zero-copy Frame (copy=False measured slower)
+            self._publisher_sync.send(message, zmq.DONTWAIT)
 
-            # Log for monitoring
-            self.logger.info(f"Signal sent: {signal['action']} {signal.get('symbol', 'N/A')} "
-                           f"(confidence: {signal.get('confidence', 0):.2%})")
+            # In-process publish latency on the monotonic clock
+            self.send_latency_samples.add((time.perf_counter_ns() - send_start) / 1_000_000)
+
+            # Log for monitoring (level checked once, not per signal)
+            if self._info_enabled:
+                self.logger.info("Signal sent: %s %s (confidence: %.2f%%)",
+                                 signal['action'], signal['symbol'], signal['confidence'] * 100)
 
             return True
 
+        except zmq.Again:
+            self.dropped_signals += 1
+            self.logger.warning("Signal dropped, send queue full (dropped: %d)", self.dropped_signals)
+            return False
         except Exception as e:
             self.logger.error(f"Failed to send signal: {e}")
             return False
@@ -98,29 +142,23 @@ class ZMQBridge:
         """Handle heartbeat messages from MT4"""
         while self.running:
             try:
-                # Wait for heartbeat message
-                message = await self.responder.recv()
+                # Wait for heartbeat message (Frame, no bytes copy)
+                frame = await self.responder.recv(copy=False)
 
-                # Deserialize
-                heartbeat_data = self.message_serializer.deserialize_heartbeat(message)
+                # Deserialize straight from the frame buffer
+                heartbeat_data = self.message_serializer.deserialize_heartbeat(frame.buffer)
 
                 # Calculate latency
                 if 'client_timestamp' in heartbeat_data:
                     latency_ns = time.time_ns() - heartbeat_data['client_timestamp']
                     latency_ms = latency_ns / 1_000_000
-                    self.latency_samples.append(latency_ms)
-
-                    # Keep only last 100 samples
-                    if len(self.latency_samples) > 100:
-                        self.latency_samples.pop(0)
+                    self.latency_samples.add(latency_ms)
 
                 # Prepare response
-                response = {
-                    'status': 'OK',
-                    'server_time': time.time_ns(),
-                    'avg_latency_ms': sum(self.latency_samples) / len(self.latency_samples) if self.latency_samples else 0,
-                    'timestamp': datetime.now().isoformat()
-                }
+                response = self._heartbeat_response
+                response['server_time'] = time.time_ns()
+                response['avg_latency_ms'] = self.latency_samples.mean
+                response['timestamp'] = iso_now()
 
                 # Send response
                 response_message = self.message_serializer.serialize_response(response)
@@ -140,15 +178,11 @@ class ZMQBridge:
 
     def get_latency_stats(self) -> Dict[str, float]:
         """Get latency statistics"""
-        if not self.latency_samples:
-            return {'avg': 0.0, 'min': 0.0, 'max': 0.0, 'count': 0}
+        return self.latency_samples.get_stats()
 
-        return {
-            'avg': sum(self.latency_samples) / len(self.latency_samples),
-            'min': min(self.latency_samples),
-            'max': max(self.latency_samples),
-            'count': len(self.latency_samples)
-        }
+    def get_send_latency_stats(self) -> Dict[str, float]:
+        """Get serialize+publish latency statistics"""
+        return self.send_latency_samples.get_stats()
 
     def is_healthy(self) -> bool:
         """Health check"""
@@ -161,28 +195,56 @@ class WebSocketBridge:
     def __init__(self):
         self.server = None
         self.clients = set()
+        self._clients_snapshot: tuple = ()  # Rebuilt on connect/disconnect for cheap fan-out
         self.running = False
         self.message_serializer = MessageSerializer()
+        self.compressor = CompressedSerializer()
         self.logger = logging.getLogger(__name__)
+        self._info_enabled = self.logger.isEnabledFor(logging.INFO)
+
+        # Outbound micro-batching
+        self._outbox: Optional[asyncio.Queue] = None
+        self._batch_task: Optional[asyncio.Task] = None
+        self.batch_max_size = settings.websocket_batch_max_size
+        self.batch_max_delay = settings.websocket_batch_max_delay_ms / 1000
+        self.dropped_signals = 0
+
+        # Inbound signal ACKs, drained in batches off the receive path
+        self._acks: Optional[asyncio.Queue] = None
+        self._ack_task: Optional[asyncio.Task] = None
+        self.dropped_acks = 0
 
         # Callbacks
         self.on_signal_request: Optional[Callable] = None
+        self.on_signal_acks: Optional[Callable] = None
         self.on_client_connected: Optional[Callable] = None
         self.on_client_disconnected: Optional[Callable] = None
 
     async def start(self):
         """Start WebSocket server"""
         self.running = True
+        self._info_enabled = self.logger.isEnabledFor(logging.INFO)
         self.logger.info(f"Starting WebSocket bridge on {settings.websocket_address}")
 
         try:
             self.server = await websockets.serve(
                 self._handle_client,
                 settings.websocket_host,
-                settings.websocket_port
+                settings.websocket_port,
+                compression=None,  # permessage-deflate costs CPU with no gain on small JSON
+                subprotocols=WS_SUBPROTOCOLS,  # Binary msgpack by default; 'json' for text-only clients
+                reuse_port=settings.websocket_reuse_port  # SO_REUSEPORT: kernel balances accepts across processes
             )
             self.logger.info("WebSocket server started")
 
+            # Start outbound batch sender
+            self._outbox = asyncio.Queue(maxsize=settings.websocket_tx_queue_size)
+            self._batch_task = asyncio.create_task(self._batch_sender())
+
+            # Start inbound ACK drainer
+            self._acks = asyncio.Queue(maxsize=settings.websocket_rx_queue_size)
+            self._ack_task = asyncio.create_task(self._ack_drainer())
+
         except Exception as e:
             self.logger.error(f"Failed to start WebSocket server: {e}")
             raise
@@ -191,6 +253,16 @@ class WebSocketBridge:
         """Stop WebSocket server"""
         self.running = False
 
+        if self._batch_task:
+            self._batch_task.cancel()
+            await asyncio.gather(self._batch_task, return_exceptions=True)
+            self._batch_task = None
+
+        if self._ack_task:
+            self._ack_task.cancel()
+            await asyncio.gather(self._ack_task, return_exceptions=True)
+            self._ack_task = None
+
         if self.server:
             self.server.close()
             await self.server.wait_closed()
@@ -198,48 +270,97 @@ class WebSocketBridge:
         # Disconnect all clients
         if self.clients:
             await asyncio.gather(
-                *[client.close() for client in self.clients],
+                *[client.close() for client in self._clients_snapshot],
                 return_exceptions=True
             )
             self.clients.clear()
+            self._clients_snapshot = ()
 
         self.logger.info("WebSocket bridge stopped")
 
-    async def broadcast_signal(self, signal: Dict[str, Any]) -> int:
-        """Broadcast signal to all connected clients"""
-        if not self.running or not self.clients:
-            return 0
+    async def broadcast_signal(self, signal: Union[SignalMessage, Dict[str, Any]]) -> bool:
+        """Queue signal for the next batch frame; True means queued, not delivered"""
+        if not self.running or not self._clients_snapshot or self._outbox is None:
+            return False
 
         # Add timestamp
         signal['server_timestamp'] = time.time_ns()
 
-        # Serialize message
-        message = self.message_serializer.serialize_signal_ws(signal)
+        # The batch sender encodes once per wire format in use and fans it out
+        try:
+            self._outbox.put_nowait(signal)
+        except asyncio.QueueFull:
+            self.dropped_signals += 1
+            self.logger.warning("Signal dropped, WebSocket outbox full (dropped: %d)", self.dropped_signals)
+            return False
 
-        # Send to all clients
-        tasks = [self._send_to_client(client, message) for client in self.clients]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return True
 
-        successful_sends = sum(1 for r in results if r is None)  # None means success
+    async def _batch_sender(self):
+        """Coalesce queued signals into one frame per client"""
+        loop = asyncio.get_running_loop()
 
-        self.logger.info(f"Signal broadcasted to {successful_sends}/{len(self.clients)} clients: "
-                        f"{signal['action']} {signal.get('symbol', 'N/A')}")
+        while self.running:
+            try:
+                batch = [await self._outbox.get()]
+
+                # Drain whatever arrives within the batching window
+                deadline = loop.time() + self.batch_max_delay
+                while len(batch) < self.batch_max_size:
+                    if not self._outbox.empty():
+                        batch.append(self._outbox.get_nowait())
+                        continue
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._outbox.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                if not self._send_batch(batch):
+                    # Every client left between queueing and sending
+                    self.dropped_signals += len(batch)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Batch sender error: {e}")
+
+    def _send_batch(self, batch: List[Union[SignalMessage, Dict[str, Any]]]) -> int:
+        """Send one batch frame to all connected clients"""
+        groups: Dict[Optional[str], list] = {}
+        for client in self._clients_snapshot:
+            if client.open:
+                groups.setdefault(client.subprotocol, []).append(client)
+        if not groups:
+            return 0
 
-        return successful_sends
-
-    async def _send_to_client(self, client: websockets.WebSocketServerProtocol, message: str):
-        """Send message to individual client"""
-        try:
-            await client.send(message)
-        except Exception as e:
-            # Remove disconnected client
-            self.clients.discard(client)
-            if self.on_client_disconnected:
-                await self.on_client_disconnected(client)
+        # Each wire format is encoded at most once per batch; broadcast writes the
+        # same frame to every transport without a coroutine per client, and closed
+        # clients are dropped by their own handler
+        frame = None
+        sent = 0
+        for subprotocol, clients in groups.items():
+            if subprotocol == 'json':
+                payload = self.message_serializer.serialize_batch_json(batch)
+            else:
+                if frame is None:
+                    frame = self.message_serializer.pack_batch(
+                        [self.message_serializer.serialize_signal_ws(signal) for signal in batch]
+                    )
+                payload = self.compressor.compress(frame) if subprotocol == 'msgpack-zstd' else frame
+            websockets.broadcast(clients, payload)  # bytes -> binary opcode, str -> text
+            sent += len(clients)
+        if self._info_enabled:
+            self.logger.info("Batch of %d signals sent to %d clients", len(batch), sent)
+
+        return sent
 
     async def _handle_client(self, websocket: websockets.WebSocketServerProtocol, path: str):
         """Handle individual client connection"""
-        self.clients.add(websocket)
+        self._add_client(websocket)
+        self._set_nodelay(websocket)
 
         client_info = f"{websocket.remote_address[0]}:{websocket.remote_address[1]}"
         self.logger.info(f"Client connected: {client_info}")
@@ -250,21 +371,22 @@ class WebSocketBridge:
         try:
             async for message in websocket:
                 try:
-                    # Parse message
-                    data = json.loads(message)
+                    # Parse and validate against the message schema in one pass;
+                    # replies use the same encoding as the request
+                    data, encode = self._decode_client_message(message)
 
                     # Handle different message types
-                    if data.get('type') == 'heartbeat':
-                        await self._handle_heartbeat(websocket, data)
-                    elif data.get('type') == 'status_request':
-                        await self._handle_status_request(websocket, data)
-                    elif data.get('type') == 'signal_ack':
-                        await self._handle_signal_ack(websocket, data)
+                    if isinstance(data, ClientHeartbeat):
+                        await self._handle_heartbeat(websocket, data, encode)
+                    elif isinstance(data, ClientStatusRequest):
+                        await self._handle_status_request(websocket, data, encode)
                     else:
-                        self.logger.warning(f"Unknown message type: {data.get('type')}")
+                        self._handle_signal_ack(websocket, data)
 
-                except json.JSONDecodeError:
-                    self.logger.error(f"Invalid JSON from client {client_info}")
+                except msgspec.ValidationError as e:
+                    self.logger.warning(f"Rejected message from client {client_info}: {e}")
+                except msgspec.DecodeError:
+                    self.logger.error(f"Invalid message from client {client_info}")
                 except Exception as e:
                     self.logger.error(f"Error handling message from {client_info}: {e}")
 
@@ -273,22 +395,53 @@ class WebSocketBridge:
         except Exception as e:
             self.logger.error(f"Client handler error for {client_info}: {e}")
         finally:
-            self.clients.discard(websocket)
+            self._remove_client(websocket)
             if self.on_client_disconnected:
                 await self.on_client_disconnected(websocket)
 
-    async def _handle_heartbeat(self, websocket: websockets.WebSocketServerProtocol, data: Dict[str, Any]):
+    @staticmethod
+    def _decode_client_message(message: Union[str, bytes]):
+        """Decode a text JSON or binary msgpack frame and pick the matching encoder"""
+        # A JSON object always starts with '{'; no msgpack map does
+        if isinstance(message, str) or message[:1] == b'{':
+            # str so websockets sends a text frame that browsers can JSON.parse
+            return CLIENT_JSON_DECODER.decode(message), lambda obj: orjson.dumps(obj).decode()
+        return CLIENT_MSGPACK_DECODER.decode(message), MSGPACK_ENCODER.encode
+
+    def _add_client(self, websocket: websockets.WebSocketServerProtocol):
+        """Register client and refresh the fan-out snapshot"""
+        self.clients.add(websocket)
+        self._clients_snapshot = tuple(self.clients)
+
+    def _remove_client(self, websocket: websockets.WebSocketServerProtocol):
+        """Unregister client and refresh the fan-out snapshot"""
+        if websocket in self.clients:
+            self.clients.discard(websocket)
+            self._clients_snapshot = tuple(self.clients)
+
+    def _set_nodelay(self, websocket: websockets.WebSocketServerProtocol):
+        """Disable Nagle so small signal frames are not delayed by the kernel"""
+        try:
+            sock = websocket.transport.get_extra_info('socket')
+            if sock is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except (AttributeError, OSError) as e:
+            self.logger.debug(f"Could not set TCP_NODELAY: {e}")
+
+    async def _handle_heartbeat(self, websocket: websockets.WebSocketServerProtocol, data: ClientHeartbeat,
+                                encode: Callable = orjson.dumps):
         """Handle heartbeat from client"""
         response = {
             'type': 'heartbeat_response',
             'server_time': time.time_ns(),
-            'client_timestamp': data.get('client_timestamp'),
+            'client_timestamp': data.client_timestamp,
             'status': 'OK'
         }
 
-        await websocket.send(json.dumps(response))
+        await websocket.send(encode(response))
 
-    async def _handle_status_request(self, websocket: websockets.WebSocketServerProtocol, data: Dict[str, Any]):
+    async def _handle_status_request(self, websocket: websockets.WebSocketServerProtocol,
+                                     data: ClientStatusRequest, encode: Callable = orjson.dumps):
         """Handle status request from client"""
         response = {
             'type': 'status_response',
@@ -297,15 +450,33 @@ class WebSocketBridge:
             'status': 'healthy' if self.running else 'unhealthy'
         }
 
-        await websocket.send(json.dumps(response))
+        await websocket.send(encode(response))
 
-    async def _handle_signal_ack(self, websocket: websockets.WebSocketServerProtocol, data: Dict[str, Any]):
-        """Handle signal acknowledgment from client"""
-        # Log acknowledgment for monitoring
-        self.logger.debug(f"Signal ACK received: {data.get('signal_id')}")
+    def _handle_signal_ack(self, websocket: websockets.WebSocketServerProtocol, data: ClientSignalAck):
+        """Queue signal acknowledgment from client without blocking the receive loop"""
+        if self._acks is None:
+            return
+        try:
+            self._acks.put_nowait(data)
+        except asyncio.QueueFull:
+            self.dropped_acks += 1
 
-        # Could implement acknowledgment tracking here
-        pass
+    async def _ack_drainer(self):
+        """Hand queued signal ACKs to the registered callback in batches"""
+        while self.running:
+            try:
+                batch = [await self._acks.get()]
+                while len(batch) < self.batch_max_size and not self._acks.empty():
+                    batch.append(self._acks.get_nowait())
+
+                self.logger.debug("Signal ACKs received: %d", len(batch))
+                if self.on_signal_acks:
+                    await self.on_signal_acks(batch)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"ACK drainer error: {e}")
 
     def get_client_count(self) -> int:
         """Get number of connected clients"""
@@ -323,14 +494,22 @@ class CommunicationManager:
         self.zmq_bridge = ZMQBridge()
         self.websocket_bridge = WebSocketBridge()
         self.active_bridge = 'zmq'  # 'zmq' or 'websocket'
+        self.standby_bridge = 'websocket'
+        self._senders = {
+            'zmq': self.zmq_bridge.send_signal,
+            'websocket': self._send_via_websocket
+        }
+        self._send = self._senders['zmq']  # Bound send method of the active bridge
         self.failover_enabled = True
         self.health_check_interval = 30  # seconds
         self.logger = logging.getLogger(__name__)
+        self._debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
         self.running = False
 
     async def start(self):
         """Start communication manager"""
         self.running = True
+        self._debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
         self.logger.info("Starting Communication Manager...")
 
         # Start both bridges
@@ -352,25 +531,32 @@ class CommunicationManager:
 
         self.logger.info("Communication Manager stopped")
 
-    async def send_signal(self, signal: Dict[str, Any]) -> bool:
+    async def send_signal(self, signal: Union[SignalMessage, Dict[str, Any]]) -> bool:
         """Send signal using active bridge"""
-        if self.active_bridge == 'zmq':
-            success = await self.zmq_bridge.send_signal(signal)
-            if not success and self.failover_enabled:
-                self.logger.warning("ZMQ send failed, switching to WebSocket")
-                self.active_bridge = 'websocket'
-                return await self.websocket_bridge.broadcast_signal(signal) > 0
-            return success
-
-        elif self.active_bridge == 'websocket':
-            success = await self.websocket_bridge.broadcast_signal(signal) > 0
-            if not success and self.failover_enabled:
-                self.logger.warning("WebSocket send failed, switching to ZMQ")
-                self.active_bridge = 'zmq'
-                return await self.zmq_bridge.send_signal(signal)
-            return success
-
-        return False
+        if await self._send(signal):
+            return True
+
+        if not self.failover_enabled:
+            return False
+
+        self.logger.warning(f"{self.active_bridge} send failed, switching to {self.standby_bridge}")
+        self._set_active_bridge(self.standby_bridge)
+        return await self._send(signal)
+
+    async def _send_via_websocket(self, signal: Union[SignalMessage, Dict[str, Any]]) -> bool:
+        """Queue for WebSocket broadcast; True only means the signal was accepted
+
+        Delivery happens later in the batch sender, so send_signal can only fail
+        over on a refused signal; losses after queueing show up in
+        websocket_dropped_signals.
+        """
+        return await self.websocket_bridge.broadcast_signal(signal)
+
+    def _set_active_bridge(self, bridge: str):
+        """Point the send method at the given bridge"""
+        self.standby_bridge = 'websocket' if bridge == 'zmq' else 'zmq'
+        self.active_bridge = bridge
+        self._send = self._senders[bridge]
 
     async def _health_monitor(self):
         """Monitor bridge health and handle failover"""
@@ -382,14 +568,16 @@ class CommunicationManager:
                 # Automatic failover logic
                 if self.active_bridge == 'zmq' and not zmq_healthy and ws_healthy:
                     self.logger.warning("ZMQ bridge unhealthy, failing over to WebSocket")
-                    self.active_bridge = 'websocket'
+                    self._set_active_bridge('websocket')
 
                 elif self.active_bridge == 'websocket' and not ws_healthy and zmq_healthy:
                     self.logger.warning("WebSocket bridge unhealthy, failing over to ZMQ")
-                    self.active_bridge = 'zmq'
+                    self._set_active_bridge('zmq')
 
                 # Log health status
-                self.logger.debug(f"Bridge health - ZMQ: {zmq_healthy}, WebSocket: {ws_healthy}, Active: {self.active_bridge}")
+                if self._debug_enabled:
+                    self.logger.debug("Bridge health - ZMQ: %s, WebSocket: %s, Active: %s",
+                                      zmq_healthy, ws_healthy, self.active_bridge)
 
                 await asyncio.sleep(self.health_check_interval)
 
@@ -400,13 +588,14 @@ class CommunicationManager:
     def _setup_callbacks(self):
         """Set up bridge callbacks"""
 
-        # ZMQ heartbeat callback
+        # ZMQ heartbeat callback; only worth a coroutine per heartbeat when debug logging is on
         async def zmq_heartbeat_handler(heartbeat_data, response):
             latency_stats = self.zmq_bridge.get_latency_stats()
-            self.logger.debug(f"ZMQ latency - Avg: {latency_stats['avg']:.2f}ms, "
-                            f"Min: {latency_stats['min']:.2f}ms, Max: {latency_stats['max']:.2f}ms")
+            self.logger.debug("ZMQ latency - Avg: %.2fms, Min: %.2fms, Max: %.2fms",
+                              latency_stats['avg'], latency_stats['min'], latency_stats['max'])
 
-        self.zmq_bridge.on_heartbeat = zmq_heartbeat_handler
+        if self._debug_enabled:
+            self.zmq_bridge.on_heartbeat = zmq_heartbeat_handler
 
         # WebSocket connection callbacks
         async def ws_client_connected(client):
@@ -426,6 +615,9 @@ class CommunicationManager:
             'websocket_healthy': self.websocket_bridge.is_healthy(),
             'websocket_clients': self.websocket_bridge.get_client_count(),
             'zmq_latency_stats': self.zmq_bridge.get_latency_stats(),
+            'zmq_send_latency_stats': self.zmq_bridge.get_send_latency_stats(),
+            'zmq_dropped_signals': self.zmq_bridge.dropped_signals,
+            'websocket_dropped_signals': self.websocket_bridge.dropped_signals,
             'failover_enabled': self.failover_enabled
         }
 
@@ -3,106 +3,127 @@ Configuration management for AI Scalping EA
 """
 
 import os
+from functools import cached_property
 from typing import List, Optional
-from pydantic import BaseSettings, Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     """Application settings with environment variable support"""
 
     # Database
-    db_password: str = Field(..., env="DB_PASSWORD")
-    postgres_db: str = Field("trading_db", env="POSTGRES_DB")
-    postgres_user: str = Field("trader", env="POSTGRES_USER")
-    database_url: str = Field(..., env="DATABASE_URL")
+    db_password: str
+    postgres_db: str = "trading_db"
+    postgres_user: str = "trader"
+    database_url: str
+    db_insert_page_size: int = 1000  # Rows per multi-row INSERT statement
 
     # AI APIs
-    gemini_api_key: str = Field(..., env="GEMINI_API_KEY")
+    gemini_api_key: str
 
     # Monitoring
-    grafana_password: str = Field(..., env="GRAFANA_PASSWORD")
+    grafana_password: str
 
     # MT4 Connection
-    mt4_server_ip: Optional[str] = Field(None, env="MT4_SERVER_IP")
-    mt4_login: Optional[str] = Field(None, env="MT4_LOGIN")
-    mt4_password: Optional[str] = Field(None, env="MT4_PASSWORD")
+    mt4_server_ip: Optional[str] = None
+    mt4_login: Optional[str] = None
+    mt4_password: Optional[str] = None
 
     # Free Tier API Keys
-    alpaca_api_key: Optional[str] = Field(None, env="ALPACA_API_KEY")
-    alpaca_secret_key: Optional[str] = Field(None, env="ALPACA_SECRET_KEY")
-    marketaux_api_key: Optional[str] = Field(None, env="MARKETAUX_API_KEY")
-    eodhd_api_key: Optional[str] = Field(None, env="EODHD_API_KEY")
-    fmp_api_key: Optional[str] = Field(None, env="FMP_API_KEY")
-    newsapi_api_key: Optional[str] = Field(None, env="NEWSAPI_API_KEY")
-    gdelt_api_key: Optional[str] = Field(None, env="GDELT_API_KEY")
+    alpaca_api_key: Optional[str] = None
+    alpaca_secret_key: Optional[str] = None
+    marketaux_api_key: Optional[str] = None
+    eodhd_api_key: Optional[str] = None
+    fmp_api_key: Optional[str] = None
+    newsapi_api_key: Optional[str] = None
+    gdelt_api_key: Optional[str] = None
 
     # Redis
-    redis_url: str = Field("redis://redis:6379", env="REDIS_URL")
+    redis_url: str = "redis://redis:6379"
+    redis_max_connections: int = 64  # Shared by every sync client in the process
 
     # Telegram Notifications
-    telegram_bot_token: Optional[str] = Field(None, env="TELEGRAM_BOT_TOKEN")
-    telegram_chat_id: Optional[str] = Field(None, env="TELEGRAM_CHAT_ID")
+    telegram_bot_token: Optional[str] = None
+    telegram_chat_id: Optional[str] = None
 
     # Security
-    secret_key: str = Field(..., env="SECRET_KEY")
-    jwt_secret_key: str = Field(..., env="JWT_SECRET_KEY")
+    secret_key: str
+    jwt_secret_key: str
 
     # Trading Parameters
-    risk_percent: float = Field(0.02, env="RISK_PERCENT")
-    max_daily_loss: float = Field(0.05, env="MAX_DAILY_LOSS")
-    min_lot_size: float = Field(0.01, env="MIN_LOT_SIZE")
-    max_lot_size: float = Field(1.0, env="MAX_LOT_SIZE")
-    atr_sl_multiplier: float = Field(1.5, env="ATR_SL_MULTIPLIER")
-    magic_number: int = Field(12345, env="MAGIC_NUMBER")
+    risk_percent: float = 0.02
+    max_daily_loss: float = 0.05
+    min_lot_size: float = 0.01
+    max_lot_size: float = 1.0
+    atr_sl_multiplier: float = 1.5
+    magic_number: int = 12345
 
     # AI Parameters
-    confidence_threshold: float = Field(0.75, env="CONFIDENCE_THRESHOLD")
-    model_update_interval: int = Field(3600, env="MODEL_UPDATE_INTERVAL")
-    backtest_period_days: int = Field(365, env="BACKTEST_PERIOD_DAYS")
+    confidence_threshold: float = 0.75
+    model_update_interval: int = 3600
+    backtest_period_days: int = 365
 
     # Monitoring
-    prometheus_port: int = Field(9090, env="PROMETHEUS_PORT")
-    grafana_port: int = Field(3000, env="GRAFANA_PORT")
-    streamlit_port: int = Field(8501, env="STREAMLIT_PORT")
+    prometheus_port: int = 9090
+    grafana_port: int = 3000
+    streamlit_port: int = 8501
 
     # ZMQ Configuration
-    zmq_signal_port: int = Field(5555, env="ZMQ_SIGNAL_PORT")
-    zmq_heartbeat_port: int = Field(5556, env="ZMQ_HEARTBEAT_PORT")
-    zmq_host: str = Field("0.0.0.0", env="ZMQ_HOST")
+    zmq_signal_port: int = 5555
+    zmq_heartbeat_port: int = 5556
+    zmq_host: str = "0.0.0.0"
+    zmq_send_hwm: int = 10_000
+    zmq_wire_format: str = "json"  # 'json' (MT4 EA) or 'msgpack'
 
     # WebSocket Fallback
-    websocket_port: int = Field(8765, env="WEBSOCKET_PORT")
-    websocket_host: str = Field("0.0.0.0", env="WEBSOCKET_HOST")
+    websocket_port: int = 8765
+    websocket_host: str = "0.0.0.0"
+    websocket_batch_max_size: int = 64
+    websocket_batch_max_delay_ms: float = 1.0
+    websocket_wire_format: str = "msgpack"  # 'msgpack' or 'compact'
+    websocket_reuse_port: bool = False  # Let several processes share the port
+    websocket_rx_queue_size: int = 10_000  # Inbound ACKs buffered before dropping
+    websocket_tx_queue_size: int = 10_000  # Outbound signals buffered before dropping
+
+    # Compression
+    compression_level: int = 3
+    compression_min_size: int = 256  # Smaller payloads are sent uncompressed
+    compression_dict_path: Optional[str] = None  # zstd --train output
 
     # Application
-    debug: bool = Field(False, env="DEBUG")
-    log_level: str = Field("INFO", env="LOG_LEVEL")
-
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
-
-    @property
+    debug: bool = False
+    log_level: str = "INFO"
+    audit_log_path: Optional[str] = None  # e.g. /app/logs/audit.jsonl; unset logs via logging
+    audit_flush_interval_ms: float = 100.0
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=False,
+        extra="ignore",  # .env also carries docker-compose variables
+        protected_namespaces=("settings_",)  # Allow model_update_interval
+    )
+
+    @cached_property
     def db_connection_string(self) -> str:
         """Database connection string"""
         return self.database_url
 
-    @property
+    @cached_property
     def redis_connection_string(self) -> str:
         """Redis connection string"""
         return self.redis_url
 
-    @property
+    @cached_property
     def zmq_signal_address(self) -> str:
         """ZMQ signal publisher address"""
         return f"tcp://{self.zmq_host}:{self.zmq_signal_port}"
 
-    @property
+    @cached_property
     def zmq_heartbeat_address(self) -> str:
         """ZMQ heartbeat responder address"""
         return f"tcp://{self.zmq_host}:{self.zmq_heartbeat_port}"
 
-    @property
+    @cached_property
     def websocket_address(self) -> str:
         """WebSocket server address"""
         return f"{self.websocket_host}:{self.websocket_port}"
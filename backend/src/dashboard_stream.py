@@ -0,0 +1,156 @@
+"""
+Dashboard Push Stream - Incremental dashboard updates over WebSocket
+Initial state comes from dashboard_snapshot(); afterwards only deltas are pushed
+"""
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import orjson
+import redis.asyncio as aioredis
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse
+
+from .config import settings
+from .database import db_manager, DASHBOARD_TRADE_EVENTS_CHANNEL
+
+# Published by DataAggregator._publish_to_redis
+TICK_CHANNELS = ("market_data:tick", "market_data:crypto_tick")
+DASHBOARD_HTML = (Path(__file__).parent / "static" / "dashboard.html").read_text(encoding="utf-8")
+
+
+def _fetch_json(query: str, params: tuple = ()) -> Dict[str, Any]:
+    """Run a JSON-returning query on a pooled connection (blocking)"""
+    conn = db_manager.get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchone()[0]
+    finally:
+        conn.rollback()  # Read-only; don't leave the pooled connection in a transaction
+        db_manager.return_connection(conn)
+
+
+def fetch_snapshot(symbol: str, signal_limit: int = 10, history_limit: int = 50) -> Dict[str, Any]:
+    """Run dashboard_snapshot() on a pooled connection (blocking)"""
+    return _fetch_json("SELECT dashboard_snapshot(%s, %s, %s)", (symbol, signal_limit, history_limit))
+
+
+def fetch_kpis() -> Dict[str, Any]:
+    """Run dashboard_kpis() on a pooled connection (blocking)"""
+    return _fetch_json("SELECT dashboard_kpis()")
+
+
+class DashboardHub:
+    """Fan one Redis subscription out to every connected dashboard"""
+
+    CLIENT_QUEUE_SIZE = 1000
+    RECONNECT_MIN_DELAY = 1.0
+    RECONNECT_MAX_DELAY = 30.0
+
+    def __init__(self):
+        self.clients: Dict[asyncio.Queue, str] = {}  # queue -> subscribed symbol
+        self.dropped_messages = 0
+        self._task: Optional[asyncio.Task] = None
+        self.logger = logging.getLogger(__name__)
+
+    def subscribe(self, symbol: str) -> asyncio.Queue:
+        """Register a client; starts the shared listener on first use"""
+        queue = asyncio.Queue(maxsize=self.CLIENT_QUEUE_SIZE)
+        self.clients[queue] = symbol
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        """Remove a client"""
+        self.clients.pop(queue, None)
+
+    async def stop(self):
+        """Stop the shared listener"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _broadcast(self, payload: bytes, symbol: Optional[str] = None):
+        """Queue payload for every client (or only those watching symbol)"""
+        for queue, client_symbol in self.clients.items():
+            if symbol is not None and client_symbol != symbol:
+                continue
+            try:
+                queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                self.dropped_messages += 1  # Slow viewer; it catches up on the next delta
+
+    async def _handle_message(self, message: Dict[str, Any]):
+        """Turn one pub/sub message into a dashboard delta"""
+        if message["channel"].decode() == DASHBOARD_TRADE_EVENTS_CHANNEL:
+            kpis = await asyncio.to_thread(fetch_kpis)
+            self._broadcast(orjson.dumps({"type": "kpi", **kpis}))
+            return
+
+        tick = orjson.loads(message["data"])
+        if "price" not in tick:
+            return
+        self._broadcast(orjson.dumps({
+            "type": "tick",
+            "symbol": tick["symbol"],
+            "t": tick["timestamp"],
+            "price": tick["price"]
+        }), tick["symbol"])
+
+    async def _listen(self):
+        """Forward ticks and trade events until cancelled, reconnecting on Redis errors"""
+        delay = self.RECONNECT_MIN_DELAY
+        while self.clients:
+            client = aioredis.Redis.from_url(settings.redis_url)
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(*TICK_CHANNELS, DASHBOARD_TRADE_EVENTS_CHANNEL)
+                delay = self.RECONNECT_MIN_DELAY
+                async for message in pubsub.listen():
+                    try:
+                        await self._handle_message(message)
+                    except Exception as e:
+                        self.logger.warning(f"Dropping dashboard update: {e}")
+            except aioredis.RedisError as e:
+                self.logger.error(f"Dashboard stream listener failed: {e}")
+                await asyncio.sleep(delay)  # Back off before reconnecting
+                delay = min(delay * 2, self.RECONNECT_MAX_DELAY)
+            finally:
+                await pubsub.aclose()
+                await client.aclose()
+
+
+dashboard_hub = DashboardHub()
+router = APIRouter(prefix="/dashboard")
+
+
+@router.get("", response_class=HTMLResponse)
+async def dashboard_page():
+    return DASHBOARD_HTML
+
+
+@router.get("/snapshot")
+async def dashboard_snapshot(symbol: str = "EURUSD"):
+    return await asyncio.to_thread(fetch_snapshot, symbol)
+
+
+@router.websocket("/stream")
+async def dashboard_stream(websocket: WebSocket, symbol: str = "EURUSD"):
+    await websocket.accept()
+    queue = dashboard_hub.subscribe(symbol)
+    try:
+        while True:
+            payload = await queue.get()
+            await websocket.send_text(payload.decode())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        dashboard_hub.unsubscribe(queue)
@@ -11,11 +11,11 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import aiohttp
 import websockets
-import redis
 import psycopg2
 from psycopg2.extras import execute_values
 
 from .config import settings
+from .database import get_redis_client
 from .utils.rate_limiter import RateLimiter
 
 
@@ -319,7 +319,7 @@ class DataAggregator:
     """Main data aggregation orchestrator"""
 
     def __init__(self):
-        self.redis_client = redis.Redis.from_url(settings.redis_url)
+        self.redis_client = get_redis_client()
         self.db_conn = None
         self.sources = {
             'mt4_ticks': MT4TickStream(),
@@ -419,14 +419,14 @@ class DataAggregator:
                 with self.db_conn.cursor() as cursor:
                     execute_values(cursor,
                         "INSERT INTO market_data (time, symbol, price, volume, bid, ask, spread, data_type) VALUES %s",
-                        market_data)
+                        market_data, page_size=settings.db_insert_page_size)
 
             # Insert news data
             if news_data:
                 with self.db_conn.cursor() as cursor:
                     execute_values(cursor,
                         "INSERT INTO news_sentiment (timestamp, symbol, headline, content, sentiment, relevance_score, url, metadata) VALUES %s",
-                        news_data)
+                        news_data, page_size=settings.db_insert_page_size)
 
             self.db_conn.commit()
 
@@ -437,18 +437,21 @@ class DataAggregator:
     async def _publish_to_redis(self, data: List[Dict[str, Any]]):
         """Publish data to Redis for AI pipeline"""
         try:
+            # One round-trip for the whole cycle instead of two commands per item
+            pipe = self.redis_client.pipeline(transaction=False)
             for item in data:
                 # Publish to appropriate channels
                 channel = f"market_data:{item['data_type']}"
-                self.redis_client.publish(channel, json.dumps(item))
+                pipe.publish(channel, json.dumps(item, default=str))
 
                 # Store in time-series
                 if "price" in item:
-                    self.redis_client.ts().add(
+                    pipe.ts().add(
                         f"ts:{item['symbol']}:{item['data_type']}",
                         int(item['timestamp'].timestamp() * 1000),
                         item['price']
                     )
+            pipe.execute()
 
         except Exception as e:
             self.logger.error(f"Error publishing to Redis: {e}")
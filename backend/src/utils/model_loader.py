@@ -4,17 +4,156 @@ Handles loading, caching, and hot-swapping of ML models
 """
 
 import asyncio
+import hashlib
 import logging
+import mmap
+import os
 import pickle
 import time
+import zipfile
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 import joblib
 
 from ..config import settings
 
 
+# Small dedicated pool for model I/O; more threads only fight over the GIL
+_MODEL_IO_POOL = ThreadPoolExecutor(
+    max_workers=min(4, os.cpu_count() or 1), thread_name_prefix='modelio'
+)
+
+# File signatures used for format sniffing
+PICKLE_MAGIC = b'\x80'
+ZIP_MAGIC = b'PK\x03\x04'
+HDF5_MAGIC = b'\x89HDF\r\n\x1a\n'
+ONNX_MAGIC = b'\x08'  # ModelProto field 1 (ir_version), varint
+# Tags of ModelProto fields 2-8 (producer_name ... opset_import), one of which follows ir_version
+ONNX_NEXT_TAGS = frozenset(b'\x12\x1a\x22\x28\x32\x3a\x42')
+
+
+def _looks_like_onnx(header: bytes) -> bool:
+    """Check for an ir_version varint followed by another ModelProto field tag"""
+    if not header.startswith(ONNX_MAGIC):
+        return False
+    # ir_version is a small varint; skip its continuation bytes
+    end = 1
+    while end < len(header) and header[end] & 0x80:
+        end += 1
+    if end + 1 >= len(header) or end > 3 or header[end] == 0:
+        return False
+    return header[end + 1] in ONNX_NEXT_TAGS
+
+
+def _zip_has(model_path: str, marker: str) -> bool:
+    """Check whether a zip archive contains an entry matching marker"""
+    try:
+        with zipfile.ZipFile(model_path) as archive:
+            return any(marker in name for name in archive.namelist())
+    except (zipfile.BadZipFile, OSError):
+        return False
+
+
+def _load_pickle(model_path: str) -> Any:
+    """Blocking pickle load, run in an executor"""
+    # Unpickled objects are always heap copies; use joblib for file-backed arrays
+    with open(model_path, 'rb') as f:
+        return pickle.load(f)
+
+
+def _load_joblib(model_path: str) -> Any:
+    """Blocking joblib load, run in an executor"""
+    # Uncompressed numpy arrays stay file-backed and shared between processes
+    return joblib.load(model_path, mmap_mode='r')
+
+
+def _load_keras(model_path: str) -> Any:
+    """Blocking TensorFlow/Keras load, run in an executor"""
+    import tensorflow as tf
+    return tf.keras.models.load_model(model_path)
+
+
+def _load_torch(model_path: str) -> Any:
+    """Blocking PyTorch load, run in an executor"""
+    import torch
+
+    # TorchScript archives carry code, not pickled classes
+    if _zip_has(model_path, '/code/'):
+        model = torch.jit.load(model_path, map_location=torch.device('cpu'))
+    else:
+        # Refuse arbitrary pickled objects; only tensors and containers
+        model = torch.load(model_path, map_location=torch.device('cpu'), weights_only=True)
+    if hasattr(model, 'eval'):
+        model.eval()  # Set to evaluation mode
+    return model
+
+
+def _load_onnx(model_path: str) -> Any:
+    """Blocking ONNX Runtime session creation, run in an executor"""
+    import onnxruntime as ort
+
+    opts = ort.SessionOptions()
+    opts.intra_op_num_threads = 1  # Small batches; avoid thread hand-off latency
+    opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+    session = ort.InferenceSession(
+        model_path, sess_options=opts, providers=['CPUExecutionProvider']
+    )
+    return OnnxModel(session)
+
+
+def file_checksum(model_path: str, drop_cache: bool = False) -> str:
+    """BLAKE2b digest of a model file, hashed straight from a memory map
+
+    drop_cache evicts the file from the page cache afterwards; use it for audits
+    of models that are not about to be loaded.
+    """
+    with open(model_path, 'rb') as f:
+        fd = f.fileno()
+        if os.fstat(fd).st_size == 0:
+            return hashlib.blake2b(digest_size=32).hexdigest()
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+            mm.madvise(mmap.MADV_SEQUENTIAL)  # Aggressive readahead for the single pass
+            # hashlib drops the GIL for large buffers, so pool threads hash in parallel
+            digest = hashlib.blake2b(mm, digest_size=32).hexdigest()
+        if drop_cache:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        return digest
+
+
+def _size_or_zero(model_path: str) -> int:
+    """File size for scheduling; unreadable files sort last"""
+    try:
+        return os.path.getsize(model_path)
+    except OSError:
+        return 0
+
+
+def _checksum_or_none(model_path: str, drop_cache: bool) -> Optional[str]:
+    """file_checksum, with None for a missing or unreadable file"""
+    try:
+        return file_checksum(model_path, drop_cache)
+    except OSError as e:
+        logging.getLogger(__name__).error(f"Failed to checksum model {model_path}: {e}")
+        return None
+
+
+def checksum_many(model_paths: List[str], drop_cache: bool = False) -> Dict[str, Optional[str]]:
+    """Hash many model files on the model I/O pool; unreadable files map to None"""
+    # Largest first so no thread is left hashing one big file at the tail
+    ordered = sorted(set(model_paths), key=_size_or_zero, reverse=True)
+    digests = _MODEL_IO_POOL.map(lambda path: _checksum_or_none(path, drop_cache), ordered)
+    return dict(zip(ordered, digests))
+
+
+async def _run_blocking(func, model_path: str) -> Any:
+    """Run a blocking loader off the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(_MODEL_IO_POOL, func, model_path)
+
+
 class ModelLoader(ABC):
     """Abstract base class for model loaders"""
 
@@ -35,9 +174,7 @@ class PickleModelLoader(ModelLoader):
     async def load_model(self, model_path: str) -> Any:
         """Load model from pickle file"""
         try:
-            with open(model_path, 'rb') as f:
-                model = pickle.load(f)
-            return model
+            return await _run_blocking(_load_pickle, model_path)
         except Exception as e:
             raise RuntimeError(f"Failed to load pickle model from {model_path}: {e}")
 
@@ -52,8 +189,7 @@ class JoblibModelLoader(ModelLoader):
     async def load_model(self, model_path: str) -> Any:
         """Load model from joblib file"""
         try:
-            model = joblib.load(model_path)
-            return model
+            return await _run_blocking(_load_joblib, model_path)
         except Exception as e:
             raise RuntimeError(f"Failed to load joblib model from {model_path}: {e}")
 
@@ -68,9 +204,7 @@ class TensorFlowModelLoader(ModelLoader):
     async def load_model(self, model_path: str) -> Any:
         """Load TensorFlow model"""
         try:
-            import tensorflow as tf
-            model = tf.keras.models.load_model(model_path)
-            return model
+            return await _run_blocking(_load_keras, model_path)
         except Exception as e:
             raise RuntimeError(f"Failed to load TensorFlow model from {model_path}: {e}")
 
@@ -85,10 +219,7 @@ class PyTorchModelLoader(ModelLoader):
     async def load_model(self, model_path: str) -> Any:
         """Load PyTorch model"""
         try:
-            import torch
-            model = torch.load(model_path, map_location=torch.device('cpu'))
-            model.eval()  # Set to evaluation mode
-            return model
+            return await _run_blocking(_load_torch, model_path)
         except Exception as e:
             raise RuntimeError(f"Failed to load PyTorch model from {model_path}: {e}")
 
@@ -97,46 +228,75 @@ class PyTorchModelLoader(ModelLoader):
         return hasattr(model, 'forward') or hasattr(model, '__call__')
 
 
+class OnnxModel:
+    """Thin wrapper giving an ONNX Runtime session the common predict() API"""
+
+    def __init__(self, session: Any):
+        self.session = session
+        self.input_name = session.get_inputs()[0].name
+
+    def run(self, output_names: Optional[list], input_feed: Dict[str, Any]) -> list:
+        """Run the underlying session"""
+        return self.session.run(output_names, input_feed)
+
+    def predict(self, features: Any) -> Any:
+        """Run inference on a feature matrix and return the first output"""
+        import numpy as np
+        inputs = np.asarray(features, dtype=np.float32)
+        return self.session.run(None, {self.input_name: inputs})[0]
+
+
+class OnnxModelLoader(ModelLoader):
+    """Loader for ONNX models served by ONNX Runtime"""
+
+    async def load_model(self, model_path: str) -> Any:
+        """Load ONNX model into an inference session"""
+        try:
+            return await _run_blocking(_load_onnx, model_path)
+        except Exception as e:
+            raise RuntimeError(f"Failed to load ONNX model from {model_path}: {e}")
+
+    def validate_model(self, model: Any) -> bool:
+        """Validate ONNX model exposes run and predict"""
+        return hasattr(model, 'run') and hasattr(model, 'predict')
+
+
 class ModelCache:
     """LRU cache for loaded models"""
 
     def __init__(self, max_size: int = 10):
-        self.cache: Dict[str, Dict[str, Any]] = {}
+        # Insertion order doubles as recency order; oldest entry first
+        self.cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()
         self.max_size = max_size
-        self.access_times: Dict[str, float] = {}
 
     def get(self, model_path: str) -> Optional[Any]:
         """Get model from cache"""
         if model_path in self.cache:
-            self.access_times[model_path] = time.time()
+            self.cache.move_to_end(model_path)
             return self.cache[model_path]['model']
         return None
 
     def put(self, model_path: str, model: Any, loader: ModelLoader):
         """Put model in cache"""
-        if len(self.cache) >= self.max_size:
+        if model_path in self.cache:
+            self.cache.move_to_end(model_path)
+        elif len(self.cache) >= self.max_size:
             # Remove least recently used
-            lru_path = min(self.access_times, key=self.access_times.get)
-            del self.cache[lru_path]
-            del self.access_times[lru_path]
+            self.cache.popitem(last=False)
 
         self.cache[model_path] = {
             'model': model,
             'loader': loader,
             'loaded_at': time.time()
         }
-        self.access_times[model_path] = time.time()
 
     def invalidate(self, model_path: str):
         """Remove model from cache"""
-        if model_path in self.cache:
-            del self.cache[model_path]
-            del self.access_times[model_path]
+        self.cache.pop(model_path, None)
 
     def clear(self):
         """Clear all cached models"""
         self.cache.clear()
-        self.access_times.clear()
 
 
 class UnifiedModelLoader:
@@ -150,7 +310,8 @@ class UnifiedModelLoader:
             '.h5': TensorFlowModelLoader(),
             '.pb': TensorFlowModelLoader(),  # TensorFlow SavedModel
             '.pt': PyTorchModelLoader(),
-            '.pth': PyTorchModelLoader()
+            '.pth': PyTorchModelLoader(),
+            '.onnx': OnnxModelLoader()
         }
         self.cache = ModelCache(max_size=20)
         self.logger = logging.getLogger(__name__)
@@ -195,18 +356,37 @@ class UnifiedModelLoader:
         return model
 
     async def _detect_format(self, model_path: str) -> Optional[ModelLoader]:
-        """Detect model format by trying different loaders"""
-        for loader in self.loaders.values():
-            try:
-                # Try loading with this loader
-                model = await loader.load_model(model_path)
-                if loader.validate_model(model):
-                    self.logger.info(f"Detected format for {model_path}: {loader.__class__.__name__}")
-                    return loader
-            except Exception:
-                continue
+        """Detect model format from the file header without loading it"""
+        path_obj = Path(model_path)
+        if path_obj.is_dir():
+            # TensorFlow SavedModel directory
+            return self.loaders['.pb'] if (path_obj / 'saved_model.pb').exists() else None
 
-        return None
+        try:
+            with open(model_path, 'rb') as f:
+                header = f.read(16)
+        except OSError as e:
+            self.logger.error(f"Cannot read model header {model_path}: {e}")
+            return None
+
+        loader = None
+        if header.startswith(HDF5_MAGIC):
+            loader = self.loaders['.h5']
+        elif header.startswith(ZIP_MAGIC):
+            if _zip_has(model_path, 'data.pkl') or _zip_has(model_path, '/code/'):
+                loader = self.loaders['.pt']
+            elif _zip_has(model_path, 'config.json') or _zip_has(model_path, 'model.json'):
+                loader = self.loaders['.h5']  # Keras v3 archive
+        elif header.startswith(PICKLE_MAGIC):
+            # Plain pickles and uncompressed joblib dumps share this header; the
+            # joblib loader reads both, the pickle loader only the former
+            loader = self.loaders['.joblib']
+        elif _looks_like_onnx(header):
+            loader = self.loaders['.onnx']
+
+        if loader:
+            self.logger.info(f"Detected format for {model_path}: {loader.__class__.__name__}")
+        return loader
 
     def invalidate_cache(self, model_path: str):
         """Invalidate cached model"""
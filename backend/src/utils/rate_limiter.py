@@ -4,8 +4,7 @@ Rate limiter utility for API calls and data sources
 
 import asyncio
 import time
-from collections import deque
-from typing import Deque, Tuple
+from array import array
 
 
 class RateLimiter:
@@ -14,12 +13,12 @@ class RateLimiter:
     def __init__(self, rate_per_second: float):
         self.rate = rate_per_second
         self.tokens = rate_per_second
-        self.last_update = time.time()
+        self.last_update = time.monotonic()
         self.max_tokens = rate_per_second * 2  # Allow burst up to 2x rate
 
     async def acquire(self) -> bool:
         """Acquire a token. Returns True if allowed, False if rate limited."""
-        now = time.time()
+        now = time.monotonic()
         elapsed = now - self.last_update
 
         # Add tokens based on elapsed time
@@ -47,29 +46,26 @@ class SlidingWindowRateLimiter:
     def __init__(self, max_requests: int, window_seconds: int):
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests: Deque[float] = deque()
+
+        # Ring of the last max_requests admission times; the slot at idx is
+        # the oldest, i.e. the request max_requests admissions ago
+        self.buf = array('d', [float('-inf')] * max_requests)
+        self.idx = 0
 
     async def acquire(self) -> bool:
         """Check if request is allowed"""
-        now = time.time()
-
-        # Remove old requests outside the window
-        while self.requests and now - self.requests[0] > self.window_seconds:
-            self.requests.popleft()
+        now = time.monotonic()
 
-        if len(self.requests) < self.max_requests:
-            self.requests.append(now)
+        if now - self.buf[self.idx] > self.window_seconds:
+            self.buf[self.idx] = now
+            self.idx = (self.idx + 1) % self.max_requests
             return True
 
         return False
 
     def get_wait_time(self) -> float:
         """Get time to wait for next request"""
-        if len(self.requests) < self.max_requests:
-            return 0.0
-
-        oldest_request = self.requests[0]
-        return self.window_seconds - (time.time() - oldest_request)
+        return max(0.0, self.window_seconds - (time.monotonic() - self.buf[self.idx]))
 
 
 class AdaptiveRateLimiter:
@@ -83,24 +79,32 @@ class AdaptiveRateLimiter:
         self.failure_count = 0
         self.adjustment_factor = 0.1
 
+        # Single bucket so tokens carry over between calls
+        self._limiter = RateLimiter(initial_rate)
+
     async def acquire(self) -> bool:
         """Acquire with adaptive rate limiting"""
-        # Simple token bucket with adaptive rate
-        limiter = RateLimiter(self.current_rate)
-        return await limiter.acquire()
+        return await self._limiter.acquire()
+
+    def _set_rate(self, rate: float):
+        """Apply a new rate to the underlying token bucket"""
+        self.current_rate = rate
+        self._limiter.rate = rate
+        self._limiter.max_tokens = rate * 2
+        self._limiter.tokens = min(self._limiter.tokens, self._limiter.max_tokens)
 
     def record_success(self):
         """Record successful API call"""
         self.success_count += 1
         if self.success_count >= 10:  # Increase rate after 10 successes
-            self.current_rate = min(self.max_rate, self.current_rate * (1 + self.adjustment_factor))
+            self._set_rate(min(self.max_rate, self.current_rate * (1 + self.adjustment_factor)))
             self.success_count = 0
 
     def record_failure(self):
         """Record failed API call (rate limit or error)"""
         self.failure_count += 1
         if self.failure_count >= 3:  # Decrease rate after 3 failures
-            self.current_rate = max(self.min_rate, self.current_rate * (1 - self.adjustment_factor))
+            self._set_rate(max(self.min_rate, self.current_rate * (1 - self.adjustment_factor)))
             self.failure_count = 0
 
     def get_current_rate(self) -> float:
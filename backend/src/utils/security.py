@@ -4,10 +4,17 @@ Security utilities for AI Scalping EA
 """
 
 import hashlib
+import ipaddress
 import secrets
 import re
 import asyncio
-from typing import Dict, List, Optional, Any
+import os
+import time
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
@@ -15,23 +22,173 @@ from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 import jwt
 import logging
+import numpy as np
+import orjson
+
+from ..config import settings
+
+# Optional linear-time regex engines for the input threat scanner
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+
+# Stateless algorithm descriptor, shared by every KDF instance
+_SHA256 = hashes.SHA256()
+
+
+@lru_cache(maxsize=64)
+def _fernet(key: bytes) -> Fernet:
+    """Cached Fernet instance per key (skips base64 decode and key split)"""
+    return Fernet(key)
+
+
+@lru_cache(maxsize=32)
+def _compile_whitelist(whitelist: Tuple[str, ...]) -> Dict[int, Tuple[List[int], List[int]]]:
+    """Compile CIDRs/IPs into merged, sorted integer ranges per IP version"""
+    ranges: Dict[int, List[Tuple[int, int]]] = {4: [], 6: []}
+    for entry in whitelist:
+        net = ipaddress.ip_network(entry, strict=False)
+        ranges[net.version].append((int(net.network_address), int(net.broadcast_address)))
+    
+    compiled = {}
+    for version, spans in ranges.items():
+        # Merge overlaps so the bisect predecessor is the only candidate
+        merged: List[List[int]] = []
+        for start, end in sorted(spans):
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        compiled[version] = ([start for start, _ in merged], [end for _, end in merged])
+    return compiled
+
+
+class _RateWindow:
+    """Per-client sliding window of 1s request buckets with a running total"""
+    
+    __slots__ = ('buckets', 'total', 'last_tick', 'blocked_until')
+    
+    def __init__(self, time_window: int, tick: int):
+        self.buckets = array('I', bytes(4 * time_window))
+        self.total = 0
+        self.last_tick = tick
+        self.blocked_until = 0.0
+    
+    def advance(self, tick: int):
+        """Expire buckets that fell out of the window since the last call"""
+        buckets = self.buckets
+        size = len(buckets)
+        elapsed = tick - self.last_tick
+        if elapsed >= size:
+            buckets[:] = array('I', bytes(4 * size))
+            self.total = 0
+        else:
+            for t in range(self.last_tick + 1, tick + 1):
+                i = t % size
+                self.total -= buckets[i]
+                buckets[i] = 0
+        self.last_tick = tick
+
+
+class AuditLog:
+    """Append-only JSON-lines audit file written off the request path"""
+    
+    MAX_PENDING = 65536
+    IOV_MAX = 1024  # Records per writev call
+    
+    def __init__(self, path: str, flush_interval: float = 0.1):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.pending: deque = deque()
+        self.dropped = 0
+        self._fd: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self.logger = logging.getLogger(__name__)
+    
+    def record(self, kind: str, data: Dict[str, Any]):
+        """Queue one record from the event loop; O(1), never touches the file"""
+        if len(self.pending) >= self.MAX_PENDING:
+            self.dropped += 1
+            return
+        self.pending.append(orjson.dumps(
+            {'ts': time.time_ns(), 'kind': kind, **data},
+            default=str, option=orjson.OPT_APPEND_NEWLINE
+        ))
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._drain())
+    
+    def _write_pending(self):
+        """Write all queued records with vectored writes, then fdatasync once"""
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        pending = self.pending
+        while pending:
+            batch = [pending.popleft() for _ in range(min(len(pending), self.IOV_MAX))]
+            os.writev(self._fd, batch)
+        os.fdatasync(self._fd)
+    
+    def flush(self):
+        """Synchronously write everything queued so far"""
+        if self.pending:
+            self._write_pending()
+    
+    async def _drain(self):
+        """Batch queued records into one write+sync per interval"""
+        while not self._closing:
+            await asyncio.sleep(self.flush_interval)
+            if not self.pending:
+                continue
+            try:
+                # fdatasync can block for milliseconds; keep it off the event loop
+                await asyncio.to_thread(self._write_pending)
+            except OSError as e:
+                self.logger.error(f"Audit log write failed: {e}")
+    
+    async def close(self):
+        """Stop the drain task, write what is left and close the file"""
+        # Let an in-flight write finish rather than cancelling under its thread
+        self._closing = True
+        if self._task:
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self.flush()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
 
 
 class SecurityManager:
     """Central security management class"""
     
-    def __init__(self):
+    RATE_LIMIT_BLOCK_SECONDS = 3600
+    RATE_LIMIT_PRUNE_INTERVAL = 60  # Seconds between sweeps of idle clients
+    
+    def __init__(self, audit_log_path: Optional[str] = None):
         self.logger = logging.getLogger(__name__)
-        self.rate_limits: Dict[str, Dict[str, Any]] = {}
+        self.rate_limits: Dict[str, _RateWindow] = {}
+        self._next_prune = 0
         self.failed_attempts: Dict[str, List[datetime]] = {}
+        self.input_validator = InputValidator()
+        self.audit_log = AuditLog(audit_log_path, settings.audit_flush_interval_ms / 1000) if audit_log_path else None
         
+    # Deliberately slow KDF: a fast hash (e.g. one BLAKE2b pass) would make
+    # offline brute force cheap, and changing it would orphan stored hashes
+    PASSWORD_HASH_ITERATIONS = 100000
+    
     def hash_password(self, password: str, salt: bytes) -> str:
         """Hash password with salt using PBKDF2"""
         kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
+            algorithm=_SHA256,
             length=32,
             salt=salt,
-            iterations=100000,
+            iterations=self.PASSWORD_HASH_ITERATIONS,
         )
         hash_value = kdf.derive(password.encode())
         return hash_value.hex()
@@ -43,59 +200,141 @@ class SecurityManager:
     async def check_rate_limit(self, client_id: str, max_requests: int, 
                              time_window: int) -> bool:
         """Check and update rate limiting"""
-        now = datetime.utcnow()
+        now = time.monotonic()
+        tick = int(now)
         
-        if client_id not in self.rate_limits:
-            self.rate_limits[client_id] = {
-                'requests': [],
-                'blocked_until': None
-            }
+        if tick >= self._next_prune:
+            self._prune_rate_limits(now, tick)
         
-        client_data = self.rate_limits[client_id]
+        window = self.rate_limits.get(client_id)
+        if window is None or len(window.buckets) != time_window:
+            window = self.rate_limits[client_id] = _RateWindow(time_window, tick)
         
         # Check if temporarily blocked
-        if client_data['blocked_until'] and now < client_data['blocked_until']:
+        if now < window.blocked_until:
             return False
         
-        # Clean old requests
-        cutoff = now - timedelta(seconds=time_window)
-        client_data['requests'] = [
-            req_time for req_time in client_data['requests']
-            if req_time > cutoff
-        ]
+        # O(1) amortised: expire stale buckets instead of rescanning timestamps
+        window.advance(tick)
         
         # Check limit
-        if len(client_data['requests']) >= max_requests:
+        if window.total >= max_requests:
             # Block for 1 hour if consistently over limit
-            client_data['blocked_until'] = now + timedelta(hours=1)
+            window.blocked_until = now + self.RATE_LIMIT_BLOCK_SECONDS
             self.logger.warning(f"Rate limit exceeded for {client_id}")
             return False
         
         # Record request
-        client_data['requests'].append(now)
+        window.buckets[tick % time_window] += 1
+        window.total += 1
         return True
     
+    def _prune_rate_limits(self, now: float, tick: int):
+        """Drop clients whose window has fully expired, bounding memory to active clients"""
+        # An expired window would be reset on the next request anyway, so
+        # dropping it is exact; blocked clients are kept until the block ends
+        stale = [
+            client_id for client_id, window in self.rate_limits.items()
+            if tick - window.last_tick >= len(window.buckets) and now >= window.blocked_until
+        ]
+        for client_id in stale:
+            del self.rate_limits[client_id]
+        self._next_prune = tick + self.RATE_LIMIT_PRUNE_INTERVAL
+    
+    async def validate_request(self, request: Dict[str, Any], client_id: str,
+                               max_requests: int = 1000, time_window: int = 60,
+                               max_amount: float = 1_000_000) -> bool:
+        """Run rate limiting and input validation for one trading request"""
+        # Checks are microseconds of GIL-bound work: run them inline and stop at the
+        # first failure (thread offload would cost more than the checks themselves).
+        # Rate limiting goes first so floods are rejected before any parsing.
+        if not await self.check_rate_limit(client_id, max_requests, time_window):
+            return False
+        
+        validator = self.input_validator
+        return (
+            validator.validate_symbol(request.get('symbol'))
+            and validator.validate_numeric(request.get('amount'), 0, max_amount)
+        )
+    
     def is_ip_allowed(self, ip_address: str, whitelist: List[str]) -> bool:
         """Check if IP is in whitelist"""
-        # Simple IP matching (in production, use proper IP range matching)
-        for allowed in whitelist:
-            if allowed.endswith('/24'):
-                # Handle subnet notation
-                network = allowed.split('/')[0]
-                base_ip = network.rsplit('.', 1)[0]
-                if ip_address.startswith(base_ip):
-                    return True
-            elif ip_address == allowed:
-                return True
-        return False
+        try:
+            ip = ipaddress.ip_address(ip_address)
+            starts, ends = _compile_whitelist(tuple(whitelist))[ip.version]
+        except ValueError as e:
+            self.logger.warning(f"IP whitelist check failed for {ip_address}: {e}")
+            return False
+        
+        # O(log N): the range starting at or before ip is the only one that can hold it
+        ip_int = int(ip)
+        i = bisect_right(starts, ip_int) - 1
+        return i >= 0 and ip_int <= ends[i]
     
     async def log_trading_activity(self, trade_data: Dict[str, Any]):
         """Log trading activity for audit"""
-        self.logger.info(f"Trading activity: {trade_data}")
+        if self.audit_log:
+            self.audit_log.record('trade', trade_data)
+        else:
+            self.logger.info(f"Trading activity: {trade_data}")
     
     async def log_authentication_attempt(self, auth_data: Dict[str, Any]):
         """Log authentication attempts"""
-        self.logger.warning(f"Auth attempt: {auth_data}")
+        if self.audit_log:
+            self.audit_log.record('auth', auth_data)
+        else:
+            self.logger.warning(f"Auth attempt: {auth_data}")
+
+
+class ThreatScanner:
+    """Multi-pattern matcher: Hyperscan DFA, else google-re2, else stdlib re"""
+    
+    def __init__(self, patterns: List[str]):
+        if hyperscan is not None:
+            self.backend = "hyperscan"
+            self._db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+            self._db.compile(
+                expressions=[p.encode() for p in patterns],
+                ids=list(range(len(patterns))),
+                elements=len(patterns),
+                flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(patterns)
+            )
+        elif re2 is not None:
+            self.backend = "re2"
+            self._regex = re2.compile("(?i)" + "|".join(patterns))
+        else:
+            self.backend = "re"
+            self._regex = re.compile("|".join(patterns), re.IGNORECASE)
+    
+    def matches(self, text: str) -> bool:
+        """True if any pattern matches text"""
+        if self.backend != "hyperscan":
+            return self._regex.search(text) is not None
+        
+        found = []
+        
+        def on_match(pattern_id, start, end, flags, context):
+            found.append(pattern_id)
+            return True  # Stop at the first hit
+        
+        try:
+            self._db.scan(text.encode(), match_event_handler=on_match)
+        except hyperscan.ScanTerminated:
+            pass
+        return bool(found)
+
+
+@lru_cache(maxsize=1024)
+def _is_valid_symbol(symbol: str) -> bool:
+    """Six ASCII letters, any case; the few symbols in use stay memoised"""
+    return len(symbol) == 6 and symbol.isascii() and symbol.isalpha()
+
+
+def _symbols_valid_mask(symbols: np.ndarray) -> np.ndarray:
+    """Vectorised symbol check over an 'S8' array, one 8-byte row per symbol"""
+    raw = symbols.view(np.uint8).reshape(-1, 8)
+    folded = raw[:, :6] | 0x20  # ASCII lower-case; only letters land in a..z
+    return ((folded >= ord('a')) & (folded <= ord('z'))).all(axis=1) & (raw[:, 6:] == 0).all(axis=1)
 
 
 class InputValidator:
@@ -108,22 +347,54 @@ class InputValidator:
     # API key patterns
     API_KEY_PATTERN = re.compile(r'^(pk|sk)_(live|test)_[a-zA-Z0-9]{32}$')
     
+    # Dangerous SQL patterns
+    SQL_INJECTION_PATTERNS = [
+        r"(\b(SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER)\b)",
+        r"(\b(UNION|JOIN|WHERE|AND|OR)\b)",
+        r"(['\"];|--|\bEXEC\b|\bEXECUTE\b)",
+        r"(\bINFORMATION_SCHEMA\b|\bUSER_TABLES\b)",
+        r"(\bOR\b\s*['\"]?1['\"]?\s*=\s*['\"]?1)"
+    ]
+    
+    # XSS patterns
+    XSS_PATTERNS = [
+        r"<script[^>]*>.*?</script>",
+        r"javascript:",
+        r"on\w+\s*=",
+        r"<iframe[^>]*>",
+        r"<object[^>]*>",
+        r"<embed[^>]*>",
+        r"vbscript:",
+        r"expression\(",
+        r"@import"
+    ]
+    
+    # Compiled once per process; one linear pass per input
+    SQL_INJECTION_SCANNER = ThreatScanner(SQL_INJECTION_PATTERNS)
+    XSS_SCANNER = ThreatScanner(XSS_PATTERNS)
+    
     def validate_symbol(self, symbol: str) -> bool:
         """Validate trading symbol"""
         if not symbol or not isinstance(symbol, str):
             return False
         
-        symbol = symbol.upper()
-        
-        # Check forex pairs
-        if self.FOREX_PATTERN.match(symbol):
-            return True
+        # Forex pairs and crypto pairs (FOREX_PATTERN covers CRYPTO_PATTERN)
+        return _is_valid_symbol(symbol)
+    
+    def validate_symbols_bulk(self, symbols: Any) -> np.ndarray:
+        """Validate a batch of symbols at once, returning a boolean mask"""
+        if isinstance(symbols, np.ndarray) and symbols.dtype == np.dtype('S8'):
+            return _symbols_valid_mask(symbols.ravel())
         
-        # Check crypto pairs
-        if self.CRYPTO_PATTERN.match(symbol):
-            return True
+        try:
+            packed = np.asarray(symbols, dtype='S8')
+            # 'S' arrays drop trailing NULs, so check the original lengths too
+            lengths = np.fromiter(map(len, symbols), dtype=np.intp, count=len(symbols))
+        except (UnicodeEncodeError, TypeError, ValueError):
+            # Non-ASCII or non-string entries: fall back to the scalar check
+            return np.array([self.validate_symbol(symbol) for symbol in symbols], dtype=bool)
         
-        return False
+        return _symbols_valid_mask(packed.ravel()) & (lengths == 6)
     
     def validate_api_key(self, api_key: str) -> bool:
         """Validate API key format"""
@@ -153,43 +424,14 @@ class InputValidator:
         if not input_str:
             return True
         
-        # Dangerous SQL patterns
-        dangerous_patterns = [
-            r"(\b(SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER)\b)",
-            r"(\b(UNION|JOIN|WHERE|AND|OR)\b)",
-            r"(['\"];|--|\bEXEC\b|\bEXECUTE\b)",
-            r"(\bINFORMATION_SCHEMA\b|\bUSER_TABLES\b)",
-            r"(\bOR\b\s*['\"]?1['\"]?\s*=\s*['\"]?1)"
-        ]
-        
-        for pattern in dangerous_patterns:
-            if re.search(pattern, input_str, re.IGNORECASE):
-                return False
-        
-        return True
+        return not self.SQL_INJECTION_SCANNER.matches(input_str)
     
     def is_xss_detected(self, input_str: str) -> bool:
         """Detect XSS patterns"""
         if not input_str:
             return False
         
-        xss_patterns = [
-            r"<script[^>]*>.*?</script>",
-            r"javascript:",
-            r"on\w+\s*=",
-            r"<iframe[^>]*>",
-            r"<object[^>]*>",
-            r"<embed[^>]*>",
-            r"vbscript:",
-            r"expression\(",
-            r"@import"
-        ]
-        
-        for pattern in xss_patterns:
-            if re.search(pattern, input_str, re.IGNORECASE):
-                return True
-        
-        return False
+        return self.XSS_SCANNER.matches(input_str)
     
     def validate_xss_safe(self, input_str: str) -> bool:
         """Check if input is XSS safe"""
@@ -208,7 +450,7 @@ class EncryptionEngine:
             # Derive key from password
             salt = secrets.token_bytes(16)
             kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
+                algorithm=_SHA256,
                 length=32,
                 salt=salt,
                 iterations=100000,
@@ -222,28 +464,49 @@ class EncryptionEngine:
     def encrypt(self, data: bytes, key: bytes) -> bytes:
         """Encrypt data with Fernet"""
         try:
-            fernet = Fernet(key)
-            return fernet.encrypt(data)
+            return _fernet(key).encrypt(data)
         except Exception as e:
             self.logger.error(f"Encryption failed: {e}")
             raise
     
+    def encrypt_many(self, items: List[bytes], key: bytes) -> List[bytes]:
+        """Encrypt a batch of values (e.g. config secrets) under one key"""
+        try:
+            encrypt = _fernet(key).encrypt
+            return [encrypt(data) for data in items]
+        except Exception as e:
+            self.logger.error(f"Batch encryption failed: {e}")
+            raise
+    
     def decrypt(self, encrypted_data: bytes, key: bytes) -> bytes:
         """Decrypt data with Fernet"""
         try:
-            fernet = Fernet(key)
-            return fernet.decrypt(encrypted_data)
+            return _fernet(key).decrypt(encrypted_data)
         except Exception as e:
             self.logger.error(f"Decryption failed: {e}")
             raise
+    
+    def decrypt_many(self, items: List[bytes], key: bytes) -> List[bytes]:
+        """Decrypt a batch of values encrypted under one key"""
+        try:
+            decrypt = _fernet(key).decrypt
+            return [decrypt(token) for token in items]
+        except Exception as e:
+            self.logger.error(f"Batch decryption failed: {e}")
+            raise
 
 
 class JWTAuthenticator:
     """JWT token management"""
     
+    VERIFIED_CACHE_SIZE = 4096
+    
     def __init__(self, secret_key: str):
         self.secret_key = secret_key
         self.algorithm = 'HS256'
+        # Token string -> verified claims; clients resend the same token on every
+        # request, so only the first use pays for base64, JSON and HMAC
+        self._verified: OrderedDict[str, Dict[str, Any]] = OrderedDict()
     
     def generate_token(self, payload: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
         """Generate JWT token"""
@@ -258,16 +521,31 @@ class JWTAuthenticator:
     
     def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Verify and decode JWT token"""
+        cached = self._verified.get(token)
+        if cached is not None:
+            # Identical bytes carry an identical signature; only expiry can change
+            if cached['exp'] > time.time():
+                self._verified.move_to_end(token)
+                return dict(cached)
+            del self._verified[token]
+            return None
+        
         try:
             payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            return payload
         except jwt.ExpiredSignatureError:
             return None
         except jwt.InvalidTokenError:
             return None
+        
+        # Only tokens with an expiry are cached, so no entry outlives its token
+        if isinstance(payload.get('exp'), (int, float)):
+            if len(self._verified) >= self.VERIFIED_CACHE_SIZE:
+                self._verified.popitem(last=False)
+            self._verified[token] = dict(payload)
+        return payload
 
 
 # Global security instances
-security_manager = SecurityManager()
+security_manager = SecurityManager(audit_log_path=settings.audit_log_path)
 input_validator = InputValidator()
 encryption_engine = EncryptionEngine()
\ No newline at end of file
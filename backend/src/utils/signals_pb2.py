@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: src/utils/signals.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x17src/utils/signals.proto\x12\x08scalping\"\xb1\x02\n\x06Signal\x12\x0c\n\x04type\x18\x01 \x01(\t\x12\x0e\n\x06symbol\x18\x02 \x01(\t\x12\x0e\n\x06\x61\x63tion\x18\x03 \x01(\t\x12\x12\n\nconfidence\x18\x04 \x01(\x02\x12\x0e\n\x06reason\x18\x05 \x01(\t\x12\x18\n\x10server_timestamp\x18\x06 \x01(\x03\x12*\n\x05votes\x18\x07 \x03(\x0b\x32\x1b.scalping.Signal.VotesEntry\x12\x30\n\x08metadata\x18\x08 \x03(\x0b\x32\x1e.scalping.Signal.MetadataEntry\x1a,\n\nVotesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x02:\x02\x38\x01\x1a/\n\rMetadataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"i\n\tHeartbeat\x12\x0c\n\x04type\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\t\x12\x13\n\x0bserver_time\x18\x03 \x01(\x03\x12\x16\n\x0e\x61vg_latency_ms\x18\x04 \x01(\x02\x12\x11\n\ttimestamp\x18\x05 \x01(\t\"\xa5\x01\n\x08Response\x12\x0c\n\x04type\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\x12*\n\x04\x64\x61ta\x18\x04 \x03(\x0b\x32\x1c.scalping.Response.DataEntry\x12\x11\n\ttimestamp\x18\x05 \x01(\t\x1a+\n\tDataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x62\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'src.utils.signals_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _SIGNAL_VOTESENTRY._options = None
+  _SIGNAL_VOTESENTRY._serialized_options = b'8\001'
+  _SIGNAL_METADATAENTRY._options = None
+  _SIGNAL_METADATAENTRY._serialized_options = b'8\001'
+  _RESPONSE_DATAENTRY._options = None
+  _RESPONSE_DATAENTRY._serialized_options = b'8\001'
+  _SIGNAL._serialized_start=38
+  _SIGNAL._serialized_end=343
+  _SIGNAL_VOTESENTRY._serialized_start=250
+  _SIGNAL_VOTESENTRY._serialized_end=294
+  _SIGNAL_METADATAENTRY._serialized_start=296
+  _SIGNAL_METADATAENTRY._serialized_end=343
+  _HEARTBEAT._serialized_start=345
+  _HEARTBEAT._serialized_end=450
+  _RESPONSE._serialized_start=453
+  _RESPONSE._serialized_end=618
+  _RESPONSE_DATAENTRY._serialized_start=575
+  _RESPONSE_DATAENTRY._serialized_end=618
+# @@protoc_insertion_point(module_scope)
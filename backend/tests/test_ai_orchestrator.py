@@ -9,7 +9,7 @@ import numpy as np
 from unittest.mock import AsyncMock, Mock, patch
 from datetime import datetime, timedelta
 
-from src.ai_orchestrator import AIOrchestrator, Agent
+from src.ai_orchestrator import AIOrchestrator, Agent, CLOSE, VOLUME, to_market_array
 from src.utils.signal_validator import SignalValidator
 
 
@@ -114,6 +114,26 @@ class TestAgent:
         
         atr = agent._calculate_atr(market_data)
         assert atr >= 0
+    
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_market_array_matches_candle_dicts(self):
+        """Pre-built column arrays and candle dicts should yield identical features"""
+        candles = [
+            {"close": 1.1000 + i * 1e-4, "high": 1.1010 + i * 1e-4, "low": 1.0990, "volume": 1000 + i}
+            for i in range(60)
+        ]
+        market = to_market_array(candles)
+        
+        assert market.shape == (5, 60)
+        assert market[CLOSE].flags["C_CONTIGUOUS"]
+        assert market[VOLUME][-1] == 1059
+        
+        for name in ("technical", "price_prediction", "risk_assessment"):
+            agent = Agent(name, f"/models/{name}.pkl", "1.0.0", 0.6)
+            from_dicts = await agent._preprocess_data({"market_data": candles})
+            from_array = await agent._preprocess_data({"market_data": market})
+            np.testing.assert_array_equal(from_dicts, from_array)
 
 
 class TestAIOrchestrator:
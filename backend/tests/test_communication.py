@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+"""
+Communication layer tests for AI Scalping EA
+"""
+
+import asyncio
+import msgspec
+import orjson
+import pytest
+import numpy as np
+from unittest.mock import Mock, patch
+
+from src.communication import WebSocketBridge
+from src.utils.latency_window import LatencyWindow
+from src.utils.message_serializer import (
+    ClientSignalAck, CompressedSerializer, MessageSerializer, ProtobufSerializer, SignalMessage
+)
+
+
+class TestBatchFraming:
+    """Test length-prefixed batch frame packing"""
+
+    @pytest.mark.unit
+    def test_pack_unpack_roundtrip(self):
+        """Batch frames should unpack to the original payloads in order"""
+        serializer = MessageSerializer()
+        payloads = [b'{"a":1}', b'', b'{"b":2}']
+
+        frame = serializer.pack_batch(payloads)
+
+        assert serializer.unpack_batch(frame) == payloads
+
+    @pytest.mark.unit
+    def test_truncated_frame_rejected(self):
+        """Truncated batch frames should raise instead of returning partial data"""
+        serializer = MessageSerializer()
+        frame = serializer.pack_batch([b'{"action":"BUY"}'])
+
+        with pytest.raises(ValueError):
+            serializer.unpack_batch(frame[:-3])
+
+
+class TestWebSocketBatching:
+    """Test WebSocket broadcast micro-batching"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_burst_coalesced_into_single_frame(self):
+        """Signals queued within the batching window go out as one frame"""
+        bridge = WebSocketBridge()
+        bridge.running = True
+        bridge._outbox = asyncio.Queue()
+        bridge.batch_max_delay = 0.005
+
+        client = Mock()
+        client.open = True
+        bridge._add_client(client)
+
+        with patch("src.communication.websockets.broadcast") as broadcast:
+            sender = asyncio.create_task(bridge._batch_sender())
+            try:
+                for i in range(5):
+                    assert await bridge.broadcast_signal({"action": "BUY", "symbol": "EURUSD", "confidence": 0.8})
+
+                await asyncio.sleep(0.05)
+            finally:
+                sender.cancel()
+                await asyncio.gather(sender, return_exceptions=True)
+
+        assert broadcast.call_count == 1
+        clients, frame = broadcast.call_args.args
+        assert clients == [client]
+        assert len(bridge.message_serializer.unpack_batch(frame)) == 5
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_full_outbox_drops_and_counts(self):
+        """A full outbox refuses the signal instead of growing without bound"""
+        bridge = WebSocketBridge()
+        bridge.running = True
+        bridge._outbox = asyncio.Queue(maxsize=2)
+        bridge._add_client(Mock(open=True))
+
+        results = [await bridge.broadcast_signal({"action": "BUY", "symbol": "EURUSD", "confidence": 0.8})
+                   for _ in range(3)]
+
+        assert results == [True, True, False]
+        assert bridge.dropped_signals == 1
+
+    @pytest.mark.unit
+    def test_json_subprotocol_gets_text_frame(self):
+        """Clients negotiating 'json' get a text JSON array, others binary msgpack"""
+        bridge = WebSocketBridge()
+        binary_client = Mock(open=True, subprotocol="msgpack")
+        json_client = Mock(open=True, subprotocol="json")
+        bridge._add_client(binary_client)
+        bridge._add_client(json_client)
+        batch = [{"action": "SELL", "symbol": "GBPUSD", "confidence": 0.9}]
+
+        with patch("src.communication.websockets.broadcast") as broadcast:
+            assert bridge._send_batch(batch) == 2
+
+        frames = {tuple(call.args[0]): call.args[1] for call in broadcast.call_args_list}
+        assert isinstance(frames[(binary_client,)], bytes)
+        assert orjson.loads(frames[(json_client,)])[0]["symbol"] == "GBPUSD"
+
+    @pytest.mark.unit
+    def test_zstd_subprotocol_shares_one_compressed_frame(self):
+        """All 'msgpack-zstd' clients get the same compressed batch frame"""
+        bridge = WebSocketBridge()
+        bridge.compressor.min_size = 0
+        clients = [Mock(open=True, subprotocol="msgpack-zstd") for _ in range(3)]
+        for client in clients:
+            bridge._add_client(client)
+        batch = [{"action": "BUY", "symbol": "EURUSD", "confidence": 0.8, "reason": "trend"}] * 10
+
+        with patch("src.communication.websockets.broadcast") as broadcast:
+            assert bridge._send_batch(batch) == 3
+
+        assert broadcast.call_count == 1
+        frame = broadcast.call_args.args[1]
+        assert frame[:4] == b"\x28\xb5\x2f\xfd"
+        decompressed = bridge.compressor._dctx.decompress(frame)
+        assert len(bridge.message_serializer.unpack_batch(decompressed)) == 10
+
+
+class TestWebSocketInbound:
+    """Test client-to-server WebSocket messages"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_reply_matches_request_encoding(self):
+        """msgpack requests get msgpack replies; JSON requests get JSON text frames"""
+        bridge = WebSocketBridge()
+        bridge.running = True
+        request = {"type": "heartbeat", "client_timestamp": 42}
+
+        for message, decode, frame_type in ((msgspec.msgpack.encode(request), msgspec.msgpack.decode, bytes),
+                                            (orjson.dumps(request).decode(), orjson.loads, str),
+                                            (orjson.dumps(request), orjson.loads, str)):
+            data, encode = bridge._decode_client_message(message)
+            websocket = Mock()
+            websocket.send = Mock(return_value=asyncio.sleep(0))
+            await bridge._handle_heartbeat(websocket, data, encode)
+
+            frame = websocket.send.call_args.args[0]
+            assert isinstance(frame, frame_type)
+            assert decode(frame)["client_timestamp"] == 42
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_signal_acks_drained_in_batches(self):
+        """ACKs are queued by the receive loop and handed over in one batch"""
+        bridge = WebSocketBridge()
+        bridge.running = True
+        bridge._acks = asyncio.Queue(maxsize=3)
+        received = []
+
+        async def on_acks(batch):
+            received.append(batch)
+
+        bridge.on_signal_acks = on_acks
+        for i in range(5):
+            bridge._handle_signal_ack(Mock(), ClientSignalAck(signal_id=i))
+        assert bridge.dropped_acks == 2
+
+        drainer = asyncio.create_task(bridge._ack_drainer())
+        await asyncio.sleep(0.01)
+        drainer.cancel()
+        await asyncio.gather(drainer, return_exceptions=True)
+
+        assert [[ack.signal_id for ack in batch] for batch in received] == [[0, 1, 2]]
+
+    @pytest.mark.unit
+    def test_client_messages_validated_while_decoding(self):
+        """Both encodings decode to typed messages; bad types fail in the decoder"""
+        bridge = WebSocketBridge()
+        ack = {"type": "signal_ack", "signal_id": "abc", "extra": 1}
+
+        for encode in (msgspec.msgpack.encode, orjson.dumps, lambda m: orjson.dumps(m).decode()):
+            data, _ = bridge._decode_client_message(encode(ack))
+            assert data == ClientSignalAck(signal_id="abc")
+
+            with pytest.raises(msgspec.ValidationError):
+                bridge._decode_client_message(encode({"type": "drop_tables"}))
+
+
+class TestSignalWireFormat:
+    """Test binary WebSocket signal encodings"""
+
+    @pytest.mark.unit
+    def test_msgpack_signal_roundtrip(self):
+        """msgpack-encoded signals should decode back to the same fields"""
+        serializer = MessageSerializer()
+        signal = {"action": "SELL", "symbol": "GBPUSD", "confidence": 0.91, "server_timestamp": 123}
+
+        decoded = serializer.deserialize_signal_ws(serializer.serialize_signal_ws(signal))
+
+        assert decoded["action"] == "SELL"
+        assert decoded["symbol"] == "GBPUSD"
+        assert decoded["server_timestamp"] == 123
+
+    @pytest.mark.unit
+    def test_compact_signal_roundtrip(self):
+        """Compact struct encoding keeps the hot fields in 21 bytes"""
+        serializer = MessageSerializer()
+        signal = {"action": "BUY", "symbol": "EURUSD", "confidence": 0.75, "server_timestamp": 1_700_000_000_000}
+
+        packed = serializer.serialize_signal_compact(signal)
+        decoded = serializer.deserialize_signal_compact(packed)
+
+        assert len(packed) == 21
+        assert decoded["action"] == "BUY"
+        assert decoded["symbol"] == "EURUSD"
+        assert decoded["confidence"] == pytest.approx(0.75)
+        assert decoded["server_timestamp"] == 1_700_000_000_000
+
+    @pytest.mark.unit
+    def test_zmq_msgpack_roundtrip(self):
+        """Opt-in msgpack ZMQ format should roundtrip signals and heartbeats"""
+        serializer = MessageSerializer()
+        serializer.zmq_msgpack = True
+        signal = {"action": "BUY", "symbol": "EURUSD", "confidence": np.float64(0.8)}
+
+        decoded = serializer.deserialize_signal(serializer.serialize_signal(signal))
+        heartbeat = serializer.deserialize_heartbeat(
+            memoryview(msgspec.msgpack.encode({"type": "heartbeat", "client_timestamp": 42}))
+        )
+
+        assert decoded["symbol"] == "EURUSD"
+        assert decoded["confidence"] == pytest.approx(0.8)
+        assert heartbeat["client_timestamp"] == 42
+
+
+    @pytest.mark.unit
+    def test_typed_signal_matches_dict_encoding(self):
+        """SignalMessage should encode to the same JSON bytes as the dict form"""
+        serializer = MessageSerializer()
+        fields = {"symbol": "EURUSD", "action": "BUY", "confidence": 0.8, "reason": "trend", "votes": {"BUY": 0.8}}
+        signal = SignalMessage(**fields)
+
+        assert serializer.serialize_signal(signal) == serializer.serialize_signal(fields)
+        assert "votes" in signal and signal["action"] == "BUY"
+        assert signal.get("missing", "default") == "default"
+
+    @pytest.mark.unit
+    def test_dict_signal_json_wire_unchanged(self):
+        """Dict signals keep the JSON layout the MT4 EA parses, numpy values included"""
+        serializer = MessageSerializer()
+        signal = {
+            "symbol": "EURUSD", "action": "SELL", "confidence": np.float32(0.75), "server_timestamp": 123,
+            "metadata": {"atr": np.float64(0.0012), "window": np.arange(3)}
+        }
+
+        decoded = orjson.loads(serializer.serialize_signal(signal))
+
+        assert list(decoded) == ["type", "symbol", "action", "confidence", "reason",
+                                 "server_timestamp", "votes", "metadata"]
+        assert decoded["type"] == "signal" and decoded["confidence"] == 0.75
+        assert decoded["metadata"] == {"atr": 0.0012, "window": [0, 1, 2]}
+
+
+    @pytest.mark.unit
+    def test_decoded_symbols_are_interned(self):
+        """Repeated decodes should share one symbol/action string object"""
+        serializer = MessageSerializer()
+        payload = serializer.serialize_signal({"action": "BUY", "symbol": "EURUSD", "confidence": 0.8})
+
+        first = serializer.deserialize_signal(payload)
+        second = serializer.deserialize_signal(payload)
+
+        assert first["symbol"] is second["symbol"]
+        assert first["action"] is second["action"]
+
+
+class TestProtobufSerializer:
+    """Test the generated Protobuf schema path"""
+
+    @pytest.mark.unit
+    def test_signal_roundtrip(self):
+        """Protobuf signals should decode back to the same fields"""
+        serializer = ProtobufSerializer()
+        signal = {
+            "action": "BUY", "symbol": "EURUSD", "confidence": 0.75,
+            "server_timestamp": 1_700_000_000_000, "votes": {"BUY": 0.5}
+        }
+
+        decoded = serializer.deserialize_signal(serializer.serialize_signal(signal))
+
+        assert decoded["action"] == "BUY"
+        assert decoded["symbol"] == "EURUSD"
+        assert decoded["confidence"] == pytest.approx(0.75)
+        assert decoded["server_timestamp"] == 1_700_000_000_000
+        assert decoded["votes"] == {"BUY": 0.5}
+
+    @pytest.mark.unit
+    def test_invalid_payload(self):
+        """Garbage input should return an error dict"""
+        assert ProtobufSerializer().deserialize_signal(b"\xff\xff\xff")["type"] == "error"
+
+
+class TestCompressedSerializer:
+    """Test zstd signal compression"""
+
+    @pytest.mark.unit
+    def test_large_signal_compressed_roundtrip(self):
+        """Payloads above the threshold should be zstd frames that roundtrip"""
+        serializer = CompressedSerializer()
+        signal = {"action": "BUY", "symbol": "EURUSD", "confidence": 0.8, "reason": "trend " * 100}
+
+        packed = serializer.serialize_signal(signal)
+        decoded = serializer.deserialize_signal(packed)
+
+        assert packed[:4] == b"\x28\xb5\x2f\xfd"
+        assert decoded["reason"] == signal["reason"]
+
+    @pytest.mark.unit
+    def test_small_signal_sent_uncompressed(self):
+        """Small payloads should skip compression"""
+        serializer = CompressedSerializer()
+        signal = {"action": "SELL", "symbol": "GBPUSD", "confidence": 0.9}
+
+        packed = serializer.serialize_signal(signal)
+
+        assert packed[:4] != b"\x28\xb5\x2f\xfd"
+        assert serializer.deserialize_signal(packed)["symbol"] == "GBPUSD"
+
+
+class TestLatencyWindow:
+    """Test incremental sliding-window latency statistics"""
+
+    @pytest.mark.unit
+    def test_matches_full_rescan(self):
+        """Incremental stats should match a rescan of the last N samples"""
+        np.random.seed(7)
+        window = LatencyWindow(size=100)
+        samples = np.random.exponential(2.0, 1000).tolist()
+
+        for i, sample in enumerate(samples):
+            window.add(sample)
+            recent = samples[max(0, i - 99):i + 1]
+
+            assert window.min == min(recent)
+            assert window.max == max(recent)
+            assert window.mean == pytest.approx(sum(recent) / len(recent))
+
+        assert len(window) == 100
+
+    @pytest.mark.unit
+    def test_empty_window_stats(self):
+        """Empty windows report zeroed statistics"""
+        assert LatencyWindow().get_stats() == {'avg': 0.0, 'min': 0.0, 'max': 0.0, 'count': 0}
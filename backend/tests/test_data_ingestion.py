@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""
+Data ingestion tests for AI Scalping EA
+"""
+
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+
+from src.data_ingestion import DataAggregator
+
+
+class TestDataAggregator:
+    """Test Redis publishing of aggregated data"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_publish_uses_single_pipeline_round_trip(self):
+        """Publishes and time-series adds for a cycle go out in one pipeline"""
+        aggregator = DataAggregator()
+        pipe = aggregator.redis_client.pipeline(transaction=False)
+        ticks = [
+            {"symbol": "EURUSD", "price": 1.1, "volume": 10,
+             "timestamp": datetime(2024, 1, 1), "data_type": "tick"},
+            {"symbol": "GBPUSD", "price": 1.3, "volume": 5,
+             "timestamp": datetime(2024, 1, 1), "data_type": "tick"},
+        ]
+
+        with patch.object(aggregator.redis_client, "pipeline", return_value=pipe), \
+                patch.object(pipe, "execute") as execute:
+            await aggregator._publish_to_redis(ticks)
+
+        execute.assert_called_once()
+        commands = [args[0] for args, _ in pipe.command_stack]
+        assert commands == ["PUBLISH", "TS.ADD", "PUBLISH", "TS.ADD"]
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Database utility tests for AI Scalping EA
+"""
+
+import asyncio
+import os
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src import database
+
+
+class _FakeListenConnection:
+    """psycopg2 connection stand-in whose fileno becomes readable on demand"""
+
+    def __init__(self):
+        self.read_fd, self.write_fd = os.pipe()
+        os.set_blocking(self.read_fd, False)
+        self.autocommit = False
+        self.notifies = []
+
+    def cursor(self):
+        return MagicMock()
+
+    def fileno(self):
+        return self.read_fd
+
+    def poll(self):
+        try:
+            os.read(self.read_fd, 1024)  # Non-blocking, like psycopg2's poll()
+        except BlockingIOError:
+            pass
+
+    def notify(self, count):
+        self.notifies.extend(object() for _ in range(count))
+        os.write(self.write_fd, b"x")
+
+    def close(self):
+        os.close(self.read_fd)
+        os.close(self.write_fd)
+
+
+class TestTradeChangeRelay:
+    """Test NOTIFY -> dashboard cache invalidation"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_notification_burst_invalidates_once(self):
+        """Several queued notifications collapse into a single cache bump"""
+        conn = _FakeListenConnection()
+        with patch.object(database.psycopg2, "connect", return_value=conn), \
+                patch.object(database, "invalidate_dashboard_trades") as invalidate:
+            task = asyncio.create_task(database.relay_trade_changes())
+            await asyncio.sleep(0.05)  # Connect runs in a worker thread
+            assert conn.autocommit is True
+
+            conn.notify(3)
+            await asyncio.sleep(0.05)
+
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        invalidate.assert_called_once()
+        assert conn.notifies == []
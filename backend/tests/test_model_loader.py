@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Model loader tests for AI Scalping EA
+"""
+
+import pickle
+import threading
+import numpy as np
+import pytest
+from unittest.mock import Mock, patch
+
+from src.utils.model_loader import (
+    JoblibModelLoader, ModelCache, OnnxModel, OnnxModelLoader,
+    PickleModelLoader, TensorFlowModelLoader, UnifiedModelLoader
+)
+
+
+class TestModelCache:
+    """Test LRU model cache"""
+
+    @pytest.mark.unit
+    def test_evicts_least_recently_used(self):
+        """Reading an entry should protect it from the next eviction"""
+        cache = ModelCache(max_size=2)
+        loader = Mock()
+        cache.put("a.pkl", "model_a", loader)
+        cache.put("b.pkl", "model_b", loader)
+
+        assert cache.get("a.pkl") == "model_a"
+        cache.put("c.pkl", "model_c", loader)
+
+        assert cache.get("b.pkl") is None
+        assert cache.get("a.pkl") == "model_a"
+        assert cache.get("c.pkl") == "model_c"
+
+    @pytest.mark.unit
+    def test_reput_does_not_evict(self):
+        """Replacing a cached model should not push out other entries"""
+        cache = ModelCache(max_size=2)
+        loader = Mock()
+        cache.put("a.pkl", "model_a", loader)
+        cache.put("b.pkl", "model_b", loader)
+        cache.put("a.pkl", "model_a2", loader)
+
+        assert cache.get("a.pkl") == "model_a2"
+        assert cache.get("b.pkl") == "model_b"
+
+
+class TestOnnxModelLoader:
+    """Test ONNX loader registration and wrapper"""
+
+    @pytest.mark.unit
+    def test_onnx_extension_registered(self):
+        """.onnx files should route to the ONNX Runtime loader"""
+        loader = UnifiedModelLoader()
+
+        assert isinstance(loader.loaders['.onnx'], OnnxModelLoader)
+
+    @pytest.mark.unit
+    def test_predict_feeds_float32_input(self):
+        """predict() should feed the session's first input as float32"""
+        session = Mock()
+        session.get_inputs.return_value = [Mock()]
+        session.get_inputs.return_value[0].name = "input"
+        session.run.return_value = [[1, 0]]
+        model = OnnxModel(session)
+
+        assert model.predict([[0.1, 0.2]]) == [1, 0]
+        _, feed = session.run.call_args[0]
+        assert feed["input"].dtype == np.float32
+        assert OnnxModelLoader().validate_model(model)
+
+
+class TestFormatDetection:
+    """Test header-based format sniffing"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_detects_by_header_without_loading(self, tmp_path):
+        """Sniffing should pick a loader without deserializing the file"""
+        loader = UnifiedModelLoader()
+        pickled = tmp_path / "model.bin"
+        pickled.write_bytes(b"\x80\x04\x95" + b"\x00" * 16)
+        hdf5 = tmp_path / "weights.bin"
+        hdf5.write_bytes(b"\x89HDF\r\n\x1a\n" + b"\x00" * 16)
+
+        for model_loader in loader.loaders.values():
+            model_loader.load_model = Mock(side_effect=AssertionError("should not load"))
+
+        assert isinstance(await loader._detect_format(str(pickled)), JoblibModelLoader)
+        assert isinstance(await loader._detect_format(str(hdf5)), TensorFlowModelLoader)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_onnx_needs_more_than_leading_byte(self, tmp_path):
+        """A lone 0x08 first byte is not enough to route a file to ONNX Runtime"""
+        loader = UnifiedModelLoader()
+        onnx_model = tmp_path / "model.bin"
+        onnx_model.write_bytes(b"\x08\x08\x12\x07pytorch" + b"\x00" * 8)
+        backspace = tmp_path / "notes.bin"
+        backspace.write_bytes(b"\x08" + b"plain text" * 2)
+
+        assert isinstance(await loader._detect_format(str(onnx_model)), OnnxModelLoader)
+        assert await loader._detect_format(str(backspace)) is None
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_unknown_header_returns_none(self, tmp_path):
+        """Unrecognised files should not be handed to any loader"""
+        unknown = tmp_path / "model.bin"
+        unknown.write_bytes(b"GARBAGE" * 4)
+
+        assert await UnifiedModelLoader()._detect_format(str(unknown)) is None
+
+
+class TestFileLoad:
+    """Test loading models from disk"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_pickle_roundtrip(self, tmp_path):
+        """Pickle models should load from the file"""
+        model_path = tmp_path / "model.pkl"
+        model_path.write_bytes(pickle.dumps({"coef": [0.5, -0.25]}))
+
+        assert await PickleModelLoader().load_model(str(model_path)) == {"coef": [0.5, -0.25]}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_joblib_arrays_are_memory_mapped(self, tmp_path):
+        """Uncompressed joblib arrays should come back file-backed"""
+        import joblib
+        model_path = tmp_path / "model.joblib"
+        joblib.dump({"weights": np.arange(1000, dtype=np.float64)}, model_path)
+
+        model = await JoblibModelLoader().load_model(str(model_path))
+
+        assert isinstance(model["weights"], np.memmap)
+        assert model["weights"][999] == 999.0
+
+
+class TestNonBlockingLoad:
+    """Test that blocking loads run off the event loop"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_pickle_load_runs_in_executor(self, tmp_path):
+        """Pickle deserialization should happen on the model I/O pool"""
+        model_path = tmp_path / "model.pkl"
+        model_path.write_bytes(pickle.dumps({"weights": [1, 2, 3]}))
+        loop_thread = threading.get_ident()
+        seen = {}
+
+        def fake_load(file):
+            seen["thread"] = threading.get_ident()
+            seen["name"] = threading.current_thread().name
+            return {"weights": [1, 2, 3]}
+
+        with patch("src.utils.model_loader.pickle.load", side_effect=fake_load):
+            model = await PickleModelLoader().load_model(str(model_path))
+
+        assert model == {"weights": [1, 2, 3]}
+        assert seen["thread"] != loop_thread
+        assert seen["name"].startswith("modelio")
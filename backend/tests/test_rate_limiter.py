@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Rate limiter tests for AI Scalping EA
+"""
+
+import pytest
+from unittest.mock import patch
+
+from src.utils.rate_limiter import AdaptiveRateLimiter, RateLimiter, SlidingWindowRateLimiter
+
+
+class TestRateLimiter:
+    """Test token bucket behaviour"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_wall_clock_jump_grants_no_tokens(self):
+        """A wall-clock step (e.g. NTP) must not refill the bucket"""
+        limiter = RateLimiter(rate_per_second=1.0)
+        assert await limiter.acquire() is True
+
+        with patch("src.utils.rate_limiter.time.time", return_value=1e12):
+            assert await limiter.acquire() is False
+
+
+class TestSlidingWindowRateLimiter:
+    """Test ring-buffer sliding window"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_window_admits_after_expiry(self):
+        """Requests beyond the limit wait until the oldest one leaves the window"""
+        limiter = SlidingWindowRateLimiter(max_requests=3, window_seconds=10)
+        clock = [1000.0]
+
+        with patch("src.utils.rate_limiter.time.monotonic", side_effect=lambda: clock[0]):
+            assert [await limiter.acquire() for _ in range(4)] == [True, True, True, False]
+            assert limiter.get_wait_time() == pytest.approx(10.0)
+
+            clock[0] += 10.5
+            assert await limiter.acquire() is True
+            assert limiter.get_wait_time() == 0.0
+
+
+class TestAdaptiveRateLimiter:
+    """Test adaptive token bucket behaviour"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_tokens_persist_between_calls(self):
+        """Burst should be bounded by a single shared bucket"""
+        limiter = AdaptiveRateLimiter(initial_rate=2.0)
+
+        results = [await limiter.acquire() for _ in range(5)]
+
+        assert results[:2] == [True, True]
+        assert results[2:] == [False, False, False]
+
+    @pytest.mark.unit
+    def test_failures_lower_bucket_rate(self):
+        """Rate adjustments should apply to the underlying bucket"""
+        limiter = AdaptiveRateLimiter(initial_rate=10.0)
+
+        for _ in range(3):
+            limiter.record_failure()
+
+        assert limiter.get_current_rate() == pytest.approx(9.0)
+        assert limiter._limiter.rate == pytest.approx(9.0)
+        assert limiter._limiter.max_tokens == pytest.approx(18.0)
@@ -5,11 +5,16 @@ AI Scalping EA Dashboard - Real-time monitoring interface
 
 import streamlit as st
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import pandas as pd
-import psycopg2
+import numpy as np
+from psycopg2.pool import ThreadedConnectionPool
 import redis
 import time
+import functools
+import hashlib
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 import json
 
@@ -25,305 +30,166 @@ st.set_page_config(
 # Initialize connections
 @st.cache_resource
 def init_connections():
-    """Initialize database and Redis connections"""
-    db_conn = psycopg2.connect(settings.database_url)
+    """Initialize database pool and Redis connection"""
+    # Pooled so concurrent viewer sessions don't serialize on one connection
+    db_pool = ThreadedConnectionPool(minconn=4, maxconn=16, dsn=settings.database_url)
     redis_client = redis.Redis.from_url(settings.redis_url)
-    return db_conn, redis_client
+    return db_pool, redis_client
 
-db_conn, redis_client = init_connections()
+db_pool, redis_client = init_connections()
 
-# Auto-refresh
-AUTO_REFRESH = st.sidebar.checkbox("Auto-refresh (1s)", value=True)
-
-def get_account_balance():
-    """Get current account balance"""
+@contextmanager
+def db_connection():
+    """Borrow a pooled connection, discarding it if it broke"""
+    conn = db_pool.getconn()
+    conn.autocommit = True  # read-only queries; don't leave sessions idle in transaction
     try:
-        cursor = db_conn.cursor()
-        cursor.execute("SELECT balance FROM account_status ORDER BY timestamp DESC LIMIT 1")
-        result = cursor.fetchone()
-        return result[0] if result else 0.0
-    except Exception as e:
-        st.error(f"Error getting balance: {e}")
-        return 0.0
+        yield conn
+    finally:
+        db_pool.putconn(conn, close=bool(conn.closed))
 
-def get_daily_pnl():
-    """Get daily P&L"""
-    try:
-        cursor = db_conn.cursor()
-        cursor.execute("""
-            SELECT COALESCE(SUM(pnl), 0)
-            FROM trade_history
-            WHERE entry_time >= CURRENT_DATE
-        """)
-        result = cursor.fetchone()
-        return result[0] if result else 0.0
-    except Exception as e:
-        st.error(f"Error getting daily P&L: {e}")
-        return 0.0
+# Bumped by the backend's trade writer so trade-derived entries miss immediately
+TRADES_VERSION_KEY = "dash:trades_version"
 
-def get_open_trades_count():
-    """Get count of open trades"""
+def get_trades_version():
+    """Current trade-data generation, read once per script run"""
     try:
-        cursor = db_conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM trade_history WHERE status = 'open'")
-        result = cursor.fetchone()
-        return result[0] if result else 0
-    except Exception as e:
-        st.error(f"Error getting open trades: {e}")
+        return int(redis_client.get(TRADES_VERSION_KEY) or 0)
+    except (redis.RedisError, ValueError):
         return 0
 
-def get_win_rate():
-    """Get win rate percentage"""
-    try:
-        cursor = db_conn.cursor()
-        cursor.execute("""
-            SELECT
-                ROUND(
-                    AVG(CASE WHEN pnl > 0 THEN 1.0 ELSE 0.0 END) * 100, 1
-                ) as win_rate
-            FROM trade_history
-            WHERE status = 'closed'
-            AND entry_time >= NOW() - INTERVAL '24 hours'
-        """)
-        result = cursor.fetchone()
-        return result[0] if result and result[0] else 0.0
-    except Exception as e:
-        st.error(f"Error getting win rate: {e}")
-        return 0.0
+trades_version = get_trades_version()
+
+def redis_cache(ttl_seconds, depends_on_trades=False):
+    """Share JSON-serializable query results between viewers and reruns for ttl_seconds
+
+    A None result marks a failed query and is never cached.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args):
+            key = f"dash:{fn.__name__}:{args!r}"
+            if depends_on_trades:
+                key += f":v{trades_version}"
+            try:
+                cached = redis_client.get(key)
+                if cached is not None:
+                    return json.loads(cached)
+            except redis.RedisError:
+                return fn(*args)
+
+            result = fn(*args)
+            if result is None:
+                return None
+            try:
+                redis_client.setex(key, ttl_seconds, json.dumps(result))
+            except redis.RedisError:
+                pass
+            return result
+        return wrapper
+    return decorator
 
-def get_avg_latency():
-    """Get average latency"""
-    try:
-        cursor = db_conn.cursor()
-        cursor.execute("""
-            SELECT AVG(metric_value)
-            FROM system_health
-            WHERE metric_name = 'zmq_latency_ms'
-            AND timestamp >= NOW() - INTERVAL '1 hour'
-        """)
-        result = cursor.fetchone()
-        return result[0] if result and result[0] else 0.0
-    except Exception as e:
-        st.error(f"Error getting latency: {e}")
-        return 0.0
-
-def get_price_data(symbol, timeframe='1m', limit=500):
-    """Get price data for charting"""
+# Auto-refresh
+AUTO_REFRESH = st.sidebar.checkbox("Auto-refresh (on new data)", value=True)
+
+# Published by DataAggregator._publish_to_redis alongside the ts:{symbol}:{type} series
+TICK_CHANNELS = ("market_data:tick", "market_data:crypto_tick")
+# Published by the backend's trade writer next to the trades-version bump
+TRADE_EVENTS_CHANNEL = "trade_events"
+MIN_REFRESH_SECONDS = 1
+# Balance and latency have no change events, so refresh them eventually
+MAX_IDLE_REFRESH_SECONDS = 30
+FIGURE_CACHE_TTL_SECONDS = 10
+# Tick line is downsampled to this many points before plotting
+TICK_CHART_POINTS = 200
+
+def lttb_indices(x, y, threshold):
+    """Indices kept by Largest-Triangle-Three-Buckets downsampling"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Interior points split into threshold - 2 buckets; first and last are always kept
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    edges = np.append(edges, n)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], edges[i + 2]
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+def get_tick_series(symbol, count=500):
+    """Get the latest ticks from the Redis time series"""
     try:
-        cursor = db_conn.cursor()
-        cursor.execute("""
-            SELECT time, price as close, volume
-            FROM market_data
-            WHERE symbol = %s
-            AND data_type = 'tick'
-            ORDER BY time DESC
-            LIMIT %s
-        """, (symbol, limit))
-
-        rows = cursor.fetchall()
-        df = pd.DataFrame(rows, columns=['time', 'close', 'volume'])
-        df['time'] = pd.to_datetime(df['time'])
-        df = df.sort_values('time')
-
-        # Add OHLC if available
-        df['open'] = df['close'].shift(1).fillna(df['close'])
-        df['high'] = df[['open', 'close']].max(axis=1)
-        df['low'] = df[['open', 'close']].min(axis=1)
-
-        return df
-    except Exception as e:
-        st.error(f"Error getting price data: {e}")
+        samples = redis_client.ts().revrange(f"ts:{symbol}:tick", "-", "+", count=count)
+    except redis.RedisError as e:
+        # A symbol with no tick series yet quietly falls back to candle closes
+        if not (isinstance(e, redis.ResponseError) and "does not exist" in str(e)):
+            st.error(f"Error getting ticks: {e}")
         return pd.DataFrame()
 
-def get_recent_signals(limit=10):
-    """Get recent AI signals"""
+    samples = np.asarray(samples[::-1], dtype=float).reshape(-1, 2)
+    samples = samples[lttb_indices(samples[:, 0], samples[:, 1], TICK_CHART_POINTS)]
+    df = pd.DataFrame(samples, columns=['time', 'price'])
+    df['time'] = pd.to_datetime(df['time'], unit='ms', utc=True)
+    return df
+
+def is_update_for(message, symbol):
+    """Whether a pub/sub message should rerender the page for symbol"""
+    if message['channel'] == TRADE_EVENTS_CHANNEL.encode():
+        return True
+    return json.loads(message['data']).get('symbol') == symbol
+
+def wait_for_update(symbol):
+    """Poll once a second until a tick for symbol or a trade event arrives (rate- and idle-capped)"""
+    # Per session: a shared subscription would hand each message to only one viewer
+    pubsub = st.session_state.get('update_pubsub')
+    if pubsub is None:
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(*TICK_CHANNELS, TRADE_EVENTS_CHANNEL)
+        st.session_state['update_pubsub'] = pubsub
+
+    # Events published while rendering stay buffered and wake us straight away
+    time.sleep(MIN_REFRESH_SECONDS)
+    heartbeat = st.empty()
+    idle_seconds = 0
+    next_second = time.monotonic() + 1
     try:
-        cursor = db_conn.cursor()
-        cursor.execute("""
-            SELECT
-                timestamp,
-                symbol,
-                ensemble_action as action,
-                ensemble_confidence as confidence,
-                reason,
-                votes
-            FROM ai_performance
-            WHERE agent_name = 'ensemble'
-            ORDER BY timestamp DESC
-            LIMIT %s
-        """, (limit,))
-
-        columns = ['timestamp', 'symbol', 'action', 'confidence', 'reason', 'votes']
-        rows = cursor.fetchall()
-
-        signals = []
-        for row in rows:
-            signal = dict(zip(columns, row))
-            signal['timestamp'] = signal['timestamp'].strftime('%H:%M:%S')
-            signals.append(signal)
-
-        return signals
-    except Exception as e:
-        st.error(f"Error getting signals: {e}")
-        return []
-
-def get_open_trades(symbol=None):
-    """Get open trades"""
-    try:
-        cursor = db_conn.cursor()
-        query = """
-            SELECT
-                trade_id,
-                symbol,
-                action,
-                entry_price,
-                lot_size,
-                pnl,
-                entry_time,
-                ticket_number
-            FROM trade_history
-            WHERE status = 'open'
-        """
-        params = []
-
-        if symbol:
-            query += " AND symbol = %s"
-            params.append(symbol)
-
-        query += " ORDER BY entry_time DESC"
-
-        cursor.execute(query, params)
-        columns = ['trade_id', 'symbol', 'action', 'entry_price', 'lot_size', 'pnl', 'entry_time', 'ticket_number']
-        rows = cursor.fetchall()
-
-        trades = []
-        for row in rows:
-            trade = dict(zip(columns, row))
-            trade['entry_time'] = trade['entry_time'].strftime('%H:%M:%S')
-            trades.append(trade)
-
-        return trades
-    except Exception as e:
-        st.error(f"Error getting open trades: {e}")
-        return []
-
-def get_active_models():
-    """Get active AI models"""
+        while idle_seconds < MAX_IDLE_REFRESH_SECONDS:
+            message = pubsub.get_message(timeout=1.0)
+            if message is not None and is_update_for(message, symbol):
+                return
+            if time.monotonic() >= next_second:
+                idle_seconds += 1
+                next_second += 1
+                # Streamlit only interrupts a run at its own calls, so touch an
+                # element each second to let widget changes apply promptly
+                heartbeat.empty()
+    except (redis.RedisError, ValueError):
+        st.session_state.pop('update_pubsub', None)
+
+@redis_cache(ttl_seconds=1, depends_on_trades=True)
+def get_dashboard_snapshot(symbol, signal_limit=10, history_limit=50):
+    """Get everything one frame renders via dashboard_snapshot() in init.sql"""
     try:
-        cursor = db_conn.cursor()
-        cursor.execute("""
-            SELECT agent_name, version, performance_score
-            FROM model_registry
-            WHERE status = 'active'
-            ORDER BY performance_score DESC
-        """)
-
-        columns = ['agent_name', 'version', 'performance_score']
-        rows = cursor.fetchall()
-
-        models = []
-        for row in rows:
-            model = dict(zip(columns, row))
-            model['performance_score'] = f"{model['performance_score']:.1%}"
-            models.append(model)
-
-        return models
+        with db_connection() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT dashboard_snapshot(%s, %s, %s)", (symbol, signal_limit, history_limit))
+            return cursor.fetchone()[0]
     except Exception as e:
-        st.error(f"Error getting models: {e}")
-        return []
-
-def get_trade_history(limit=50):
-    """Get trade history"""
-    try:
-        cursor = db_conn.cursor()
-        cursor.execute("""
-            SELECT
-                trade_id,
-                symbol,
-                action,
-                entry_price,
-                exit_price,
-                lot_size,
-                pnl,
-                entry_time,
-                exit_time,
-                confidence,
-                status
-            FROM trade_history
-            WHERE status = 'closed'
-            ORDER BY exit_time DESC
-            LIMIT %s
-        """, (limit,))
-
-        columns = ['trade_id', 'symbol', 'action', 'entry_price', 'exit_price', 'lot_size', 'pnl', 'entry_time', 'exit_time', 'confidence', 'status']
-        rows = cursor.fetchall()
-
-        trades = []
-        for row in rows:
-            trade = dict(zip(columns, row))
-            if trade['entry_time']:
-                trade['entry_time'] = trade['entry_time'].strftime('%Y-%m-%d %H:%M:%S')
-            if trade['exit_time']:
-                trade['exit_time'] = trade['exit_time'].strftime('%Y-%m-%d %H:%M:%S')
-            trades.append(trade)
-
-        return pd.DataFrame(trades)
-    except Exception as e:
-        st.error(f"Error getting trade history: {e}")
-        return pd.DataFrame()
-
-# Main dashboard
-st.title("🚀 AI Scalping EA Dashboard")
-
-# Metrics row
-col1, col2, col3, col4 = st.columns(4)
-
-with col1:
-    balance = get_account_balance()
-    daily_pnl = get_daily_pnl()
-    pnl_color = "inverse" if daily_pnl >= 0 else "normal"
-    st.metric(
-        "Balance",
-        f"${balance:,.2f}",
-        f"{daily_pnl:+,.2f}",
-        delta_color=pnl_color
-    )
-
-with col2:
-    open_trades = get_open_trades_count()
-    win_rate = get_win_rate()
-    st.metric(
-        "Open Trades",
-        open_trades,
-        f"{win_rate:.1f}% Win Rate"
-    )
-
-with col3:
-    st.metric(
-        "Today's P&L",
-        f"${daily_pnl:,.2f}",
-        f"{(daily_pnl / balance * 100) if balance > 0 else 0:.2f}%"
-    )
-
-with col4:
-    avg_latency = get_avg_latency()
-    st.metric(
-        "Avg Latency",
-        f"{avg_latency:.1f} ms",
-        delta="-2.3 ms",
-        delta_color="inverse"
-    )
-
-# Main chart
-st.header("📊 Live Trading Chart")
+        st.error(f"Error getting dashboard data: {e}")
+        return None
 
-symbol = st.selectbox("Symbol", ["EURUSD", "GBPUSD", "BTCUSD", "ETHUSD"], key="symbol_select")
-chart_type = st.radio("Chart Type", ["Candlestick", "Line"], horizontal=True, key="chart_type")
-
-# Get data
-df = get_price_data(symbol, limit=500)
-
-if not df.empty:
+def build_price_figure(symbol, df, trades, ticks, use_candles):
+    """Build the price/volume/RSI subplot figure"""
     # Create subplots
     fig = make_subplots(
         rows=3, cols=1,
@@ -334,7 +200,7 @@ if not df.empty:
     )
 
     # Main chart
-    if chart_type == "Candlestick" and len(df) > 1:
+    if use_candles:
         fig.add_trace(
             go.Candlestick(
                 x=df['time'],
@@ -347,26 +213,36 @@ if not df.empty:
             row=1, col=1
         )
     else:
+        # Tick-level line straight from Redis; fall back to candle closes
         fig.add_trace(
             go.Scatter(
-                x=df['time'],
-                y=df['close'],
+                x=ticks['time'] if not ticks.empty else df['time'],
+                y=ticks['price'] if not ticks.empty else df['close'],
                 name="Price",
                 line=dict(width=2)
             ),
             row=1, col=1
         )
 
-    # Annotate open trades
-    open_trades = get_open_trades(symbol)
-    for trade in open_trades:
-        fig.add_annotation(
-            x=trade['entry_time'],
-            y=trade['entry_price'],
-            text=f"{trade['action']} #{trade['ticket_number']}<br>P&L: ${trade['pnl']:.2f}",
-            showarrow=True,
-            arrowhead=2,
-            arrowcolor="green" if trade['action'] == "BUY" else "red",
+    # Mark open trades with one trace rather than one annotation per trade
+    if not trades.empty:
+        is_buy = trades['action'] == "BUY"
+        fig.add_trace(
+            go.Scatter(
+                x=pd.to_datetime(trades['entry_time']),
+                y=trades['entry_price'],
+                mode='markers+text',
+                text=trades['action'] + " #" + trades['ticket_number'].astype(str),
+                textposition="top center",
+                hovertext="P&L: $" + trades['pnl'].map('{:.2f}'.format),
+                hoverinfo='text',
+                marker=dict(
+                    color=is_buy.map({True: "green", False: "red"}),
+                    symbol=is_buy.map({True: "triangle-up", False: "triangle-down"}),
+                    size=12
+                ),
+                name="Open Trades"
+            ),
             row=1, col=1
         )
 
@@ -385,19 +261,12 @@ if not df.empty:
             row=2, col=1
         )
 
-    # RSI (placeholder - calculate from price data)
-    if len(df) > 14:
-        # Simple RSI calculation
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-
+    # RSI (computed by latest_indicators_1m in init.sql)
+    if df['rsi'].notna().any():
         fig.add_trace(
             go.Scatter(
                 x=df['time'],
-                y=rsi,
+                y=df['rsi'],
                 name="RSI",
                 line=dict(color='purple')
             ),
@@ -414,7 +283,92 @@ if not df.empty:
         xaxis_rangeslider_visible=False
     )
 
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
+
+# Main dashboard
+st.title("🚀 AI Scalping EA Dashboard")
+
+symbol = st.selectbox("Symbol", ["EURUSD", "GBPUSD", "BTCUSD", "ETHUSD"], key="symbol_select")
+snapshot = get_dashboard_snapshot(symbol) or {}
+
+# Metrics row
+col1, col2, col3, col4 = st.columns(4)
+kpis = snapshot.get('kpis') or {}
+balance = float(kpis.get('balance', 0))
+daily_pnl = float(kpis.get('daily_pnl', 0))
+open_trades = kpis.get('open_trades', 0)
+win_rate = float(kpis.get('win_rate', 0))
+avg_latency = float(kpis.get('avg_latency', 0))
+
+with col1:
+    pnl_color = "inverse" if daily_pnl >= 0 else "normal"
+    st.metric(
+        "Balance",
+        f"${balance:,.2f}",
+        f"{daily_pnl:+,.2f}",
+        delta_color=pnl_color
+    )
+
+with col2:
+    st.metric(
+        "Open Trades",
+        open_trades,
+        f"{win_rate:.1f}% Win Rate"
+    )
+
+with col3:
+    st.metric(
+        "Today's P&L",
+        f"${daily_pnl:,.2f}",
+        f"{(daily_pnl / balance * 100) if balance > 0 else 0:.2f}%"
+    )
+
+with col4:
+    st.metric(
+        "Avg Latency",
+        f"{avg_latency:.1f} ms",
+        delta="-2.3 ms",
+        delta_color="inverse"
+    )
+
+# Main chart
+st.header("📊 Live Trading Chart")
+
+chart_type = st.radio("Chart Type", ["Candlestick", "Line"], horizontal=True, key="chart_type")
+
+# Get data
+prices = snapshot.get('prices', [])
+
+if prices:
+    open_trade_rows = snapshot.get('open_trades', [])
+    use_candles = chart_type == "Candlestick" and len(prices) > 1
+    ticks = pd.DataFrame() if use_candles else get_tick_series(symbol)
+
+    # Figure only changes with the newest candle, open trades or newest tick
+    fig_key = "dash:fig:" + hashlib.sha1(repr((
+        symbol, use_candles, len(prices), prices[-1],
+        [(t['trade_id'], t['pnl']) for t in open_trade_rows],
+        None if ticks.empty else ticks['time'].iloc[-1]
+    )).encode()).hexdigest()
+
+    try:
+        fig_json = redis_client.get(fig_key)
+    except redis.RedisError:
+        fig_json = None
+
+    if fig_json is None:
+        df = pd.DataFrame(prices)
+        df['time'] = pd.to_datetime(df['time'])
+        price_columns = ['open', 'high', 'low', 'close', 'volume', 'rsi']
+        df[price_columns] = df[price_columns].astype(float)
+
+        fig_json = build_price_figure(symbol, df, pd.DataFrame(open_trade_rows), ticks, use_candles).to_json()
+        try:
+            redis_client.setex(fig_key, FIGURE_CACHE_TTL_SECONDS, fig_json)
+        except redis.RedisError:
+            pass
+
+    st.plotly_chart(pio.from_json(fig_json), use_container_width=True)
 else:
     st.warning("No price data available. Make sure the data ingestion is running.")
 
@@ -425,26 +379,25 @@ col1, col2 = st.columns([2, 1])
 
 with col1:
     st.subheader("Recent Signals")
-    signals = get_recent_signals(limit=10)
+    signals = snapshot.get('signals', [])
 
     if signals:
         for signal in signals:
             with st.expander(f"{signal['timestamp']} - {signal['symbol']} {signal['action']}", expanded=False):
-                st.write(f"**Confidence:** {signal['confidence']:.1%}")
+                st.write(f"**Confidence:** {signal['confidence']}")
                 st.write(f"**Reason:** {signal['reason']}")
 
-                if 'votes' in signal and signal['votes']:
-                    votes = signal['votes']
+                if signal['has_votes']:
                     st.write("**Agent Votes:**")
-                    st.write(f"• BUY: {votes.get('BUY', 0):.2f}")
-                    st.write(f"• SELL: {votes.get('SELL', 0):.2f}")
-                    st.write(f"• HOLD: {votes.get('HOLD', 0):.2f}")
+                    st.write(f"• BUY: {signal['vote_buy']}")
+                    st.write(f"• SELL: {signal['vote_sell']}")
+                    st.write(f"• HOLD: {signal['vote_hold']}")
     else:
         st.info("No recent signals available.")
 
 with col2:
     st.subheader("Active Models")
-    models = get_active_models()
+    models = snapshot.get('models', [])
 
     if models:
         for model in models:
@@ -459,32 +412,31 @@ with col2:
 # Trade History Table
 st.header("📊 Recent Trades")
 
-trades_df = get_trade_history(limit=50)
+trades_df = pd.DataFrame(snapshot.get('history', []))
 
 if not trades_df.empty:
-    # Style the dataframe
-    def color_pnl(val):
-        color = 'green' if val > 0 else 'red' if val < 0 else 'black'
-        return f'color: {color}'
-
-    styled_df = trades_df.style.applymap(color_pnl, subset=['pnl'])
+    # Colors come precomputed from dashboard_snapshot(); style the column in one call
+    styled_df = (trades_df.style
+                 .apply(lambda _: 'color: ' + trades_df['pnl_color'], subset=['pnl'])
+                 .hide(subset=['pnl_color'], axis='columns'))
     st.dataframe(styled_df, use_container_width=True)
 
-    # Summary stats
-    total_trades = len(trades_df)
-    winning_trades = len(trades_df[trades_df['pnl'] > 0])
-    win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-    total_pnl = trades_df['pnl'].sum()
+    # Summary stats, precomputed by the trade_stats_24h view
+    stats = snapshot.get('trade_stats') or {}
+    total_trades = stats.get('total_trades', 0)
+    win_rate = float(stats.get('win_rate', 0))
+    total_pnl = float(stats.get('total_pnl', 0))
+    avg_trade = float(stats.get('avg_trade', 0))
 
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Total Trades", total_trades)
+        st.metric("Total Trades (24h)", total_trades)
     with col2:
-        st.metric("Win Rate", f"{win_rate:.1f}%")
+        st.metric("Win Rate (24h)", f"{win_rate:.1f}%")
     with col3:
-        st.metric("Total P&L", f"${total_pnl:.2f}")
+        st.metric("Total P&L (24h)", f"${total_pnl:.2f}")
     with col4:
-        st.metric("Avg Trade", f"${total_pnl/total_trades:.2f}" if total_trades > 0 else "$0.00")
+        st.metric("Avg Trade (24h)", f"${avg_trade:.2f}")
 else:
     st.info("No trade history available.")
 
@@ -514,7 +466,7 @@ with col3:
 
 # Auto-refresh
 if AUTO_REFRESH:
-    time.sleep(1)
+    wait_for_update(symbol)
     st.rerun()
 
 # Footer
@@ -22,6 +22,7 @@ SELECT create_hypertable('market_data', 'time', if_not_exists => TRUE);
 -- Create indexes for efficient queries
 CREATE INDEX IF NOT EXISTS idx_market_data_symbol_time ON market_data (symbol, time DESC);
 CREATE INDEX IF NOT EXISTS idx_market_data_data_type ON market_data (data_type);
+CREATE INDEX IF NOT EXISTS idx_market_data_symbol_type_time ON market_data (symbol, data_type, time DESC);
 
 -- Model registry table
 CREATE TABLE IF NOT EXISTS model_registry (
@@ -66,6 +67,9 @@ CREATE INDEX IF NOT EXISTS idx_trade_history_symbol ON trade_history (symbol);
 CREATE INDEX IF NOT EXISTS idx_trade_history_status ON trade_history (status);
 CREATE INDEX IF NOT EXISTS idx_trade_history_entry_time ON trade_history (entry_time DESC);
 CREATE INDEX IF NOT EXISTS idx_trade_history_pnl ON trade_history (pnl);
+-- Dashboard: 24h closed-trade stats and most recently closed trades
+CREATE INDEX IF NOT EXISTS idx_trade_history_closed_entry ON trade_history (entry_time DESC) WHERE status = 'closed';
+CREATE INDEX IF NOT EXISTS idx_trade_history_closed_exit ON trade_history (exit_time DESC) WHERE status = 'closed';
 
 -- AI performance metrics table
 CREATE TABLE IF NOT EXISTS ai_performance (
@@ -82,6 +86,7 @@ SELECT create_hypertable('ai_performance', 'timestamp', if_not_exists => TRUE);
 -- Create indexes
 CREATE INDEX IF NOT EXISTS idx_ai_performance_agent ON ai_performance (agent_name);
 CREATE INDEX IF NOT EXISTS idx_ai_performance_metric ON ai_performance (metric_name);
+CREATE INDEX IF NOT EXISTS idx_ai_performance_ensemble ON ai_performance (timestamp DESC) WHERE agent_name = 'ensemble';
 
 -- System health monitoring
 CREATE TABLE IF NOT EXISTS system_health (
@@ -96,6 +101,9 @@ CREATE TABLE IF NOT EXISTS system_health (
 -- Convert to hypertable
 SELECT create_hypertable('system_health', 'timestamp', if_not_exists => TRUE);
 
+-- Create indexes
+CREATE INDEX IF NOT EXISTS idx_system_health_metric_time ON system_health (metric_name, timestamp DESC);
+
 -- News and sentiment data
 CREATE TABLE IF NOT EXISTS news_sentiment (
     timestamp TIMESTAMPTZ NOT NULL DEFAULT NOW(),
@@ -178,6 +186,178 @@ SELECT add_continuous_aggregate_policy('daily_trade_summary',
     end_offset => INTERVAL '1 hour',
     schedule_interval => INTERVAL '1 hour');
 
+-- 1-minute candles built from ticks; real-time mode merges the still-open bucket
+CREATE MATERIALIZED VIEW IF NOT EXISTS ohlc_1m
+WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+SELECT
+    symbol,
+    time_bucket('1 minute', time) AS bucket,
+    first(price, time) AS open,
+    max(price) AS high,
+    min(price) AS low,
+    last(price, time) AS close,
+    sum(volume) AS volume
+FROM market_data
+WHERE data_type = 'tick'
+GROUP BY symbol, bucket
+WITH NO DATA;
+
+SELECT add_continuous_aggregate_policy('ohlc_1m',
+    start_offset => INTERVAL '1 day',
+    end_offset => INTERVAL '1 minute',
+    schedule_interval => INTERVAL '1 minute');
+
+-- Latest n candles plus 14-period RSI (simple moving average of gains/losses).
+-- Only the n + 14 newest candles are read, so cost doesn't grow with history.
+CREATE OR REPLACE FUNCTION latest_indicators_1m(sym TEXT, n INT)
+RETURNS TABLE (bucket TIMESTAMPTZ, open NUMERIC, high NUMERIC, low NUMERIC,
+               close NUMERIC, volume NUMERIC, rsi NUMERIC) AS $$
+    SELECT bucket, open, high, low, close, volume, rsi
+    FROM (
+        SELECT
+            bucket,
+            open,
+            high,
+            low,
+            close,
+            volume,
+            CASE
+                WHEN COUNT(delta) OVER w < 14 THEN NULL
+                WHEN AVG(LEAST(delta, 0)) OVER w = 0 THEN 100
+                ELSE ROUND(100 - 100 / (1 + AVG(GREATEST(delta, 0)) OVER w / -AVG(LEAST(delta, 0)) OVER w), 2)
+            END AS rsi
+        FROM (
+            SELECT recent.*, recent.close - LAG(recent.close) OVER (ORDER BY recent.bucket) AS delta
+            FROM (
+                SELECT * FROM ohlc_1m
+                WHERE ohlc_1m.symbol = sym
+                ORDER BY ohlc_1m.bucket DESC
+                LIMIT n + 14
+            ) recent
+        ) candles
+        WINDOW w AS (ORDER BY bucket ROWS BETWEEN 13 PRECEDING AND CURRENT ROW)
+    ) indicators
+    ORDER BY bucket DESC
+    LIMIT n;
+$$ LANGUAGE sql STABLE;
+
+-- Rolling 24h trade stats for the dashboard; always exactly one row
+CREATE MATERIALIZED VIEW IF NOT EXISTS trade_stats_24h AS
+SELECT
+    1 AS id,
+    COUNT(*) AS total_trades,
+    COUNT(*) FILTER (WHERE pnl > 0) AS winning_trades,
+    COALESCE(ROUND(AVG(CASE WHEN pnl > 0 THEN 1.0 ELSE 0.0 END) * 100, 1), 0) AS win_rate,
+    COALESCE(SUM(pnl), 0) AS total_pnl,
+    COALESCE(ROUND(AVG(pnl), 2), 0) AS avg_trade
+FROM trade_history
+WHERE status = 'closed'
+AND entry_time >= NOW() - INTERVAL '24 hours';
+
+-- REFRESH ... CONCURRENTLY needs a unique index; readers are never blocked
+CREATE UNIQUE INDEX IF NOT EXISTS idx_trade_stats_24h_id ON trade_stats_24h (id);
+
+CREATE OR REPLACE PROCEDURE refresh_trade_stats_24h(job_id INT, config JSONB)
+LANGUAGE plpgsql AS $$
+BEGIN
+    REFRESH MATERIALIZED VIEW CONCURRENTLY trade_stats_24h;
+END;
+$$;
+
+-- Refresh every 5 seconds via the TimescaleDB job scheduler (once, on re-runs too)
+SELECT add_job('refresh_trade_stats_24h', INTERVAL '5 seconds')
+WHERE NOT EXISTS (
+    SELECT 1 FROM timescaledb_information.jobs WHERE proc_name = 'refresh_trade_stats_24h'
+);
+
+-- Headline KPIs only; pushed to live dashboards on every trade event
+CREATE OR REPLACE FUNCTION dashboard_kpis()
+RETURNS JSON AS $$
+    SELECT json_build_object(
+        'balance', COALESCE((SELECT balance FROM account_status ORDER BY timestamp DESC LIMIT 1), 0),
+        'daily_pnl', (SELECT COALESCE(SUM(pnl), 0) FROM trade_history WHERE entry_time >= CURRENT_DATE),
+        'open_trades', (SELECT COUNT(*) FROM trade_history WHERE status = 'open'),
+        'win_rate', COALESCE((SELECT win_rate FROM trade_stats_24h), 0),
+        'avg_latency', COALESCE((
+            SELECT AVG(metric_value)
+            FROM system_health
+            WHERE metric_name = 'zmq_latency_ms'
+            AND timestamp >= NOW() - INTERVAL '1 hour'
+        ), 0)
+    );
+$$ LANGUAGE sql STABLE;
+
+-- Everything one dashboard frame needs, as a single JSON document (one round-trip)
+CREATE OR REPLACE FUNCTION dashboard_snapshot(sym TEXT, sig_limit INT, hist_limit INT)
+RETURNS JSON AS $$
+BEGIN
+    RETURN json_build_object(
+        'kpis', dashboard_kpis(),
+        'trade_stats', (
+            SELECT row_to_json(s)
+            FROM (SELECT total_trades, win_rate, total_pnl, avg_trade FROM trade_stats_24h) s
+        ),
+        'prices', (
+            SELECT COALESCE(json_agg(p ORDER BY p.time), '[]')
+            FROM (
+                SELECT bucket AS time, open, high, low, close, volume, rsi
+                FROM latest_indicators_1m(sym, 120)
+            ) p
+        ),
+        'open_trades', (
+            SELECT COALESCE(json_agg(t), '[]')
+            FROM (
+                SELECT trade_id, symbol, action, entry_price, lot_size, COALESCE(pnl, 0) AS pnl,
+                       entry_time, ticket_number
+                FROM trade_history
+                WHERE status = 'open' AND symbol = sym
+                ORDER BY trade_history.entry_time DESC
+            ) t
+        ),
+        'signals', (
+            SELECT COALESCE(json_agg(g), '[]')
+            FROM (
+                SELECT to_char(timestamp, 'HH24:MI:SS') AS timestamp, symbol,
+                       ensemble_action AS action,
+                       to_char(ensemble_confidence * 100, 'FM990.0') || '%' AS confidence, reason,
+                       votes IS NOT NULL AS has_votes,
+                       to_char(COALESCE((votes->>'BUY')::float, 0), 'FM990.00') AS vote_buy,
+                       to_char(COALESCE((votes->>'SELL')::float, 0), 'FM990.00') AS vote_sell,
+                       to_char(COALESCE((votes->>'HOLD')::float, 0), 'FM990.00') AS vote_hold
+                FROM ai_performance
+                WHERE agent_name = 'ensemble'
+                ORDER BY ai_performance.timestamp DESC
+                LIMIT sig_limit
+            ) g
+        ),
+        'models', (
+            SELECT COALESCE(json_agg(m), '[]')
+            FROM (
+                SELECT agent_name, version,
+                       to_char(performance_score * 100, 'FM990.0') || '%' AS performance_score
+                FROM model_registry
+                WHERE status = 'active'
+                ORDER BY model_registry.performance_score DESC
+            ) m
+        ),
+        'history', (
+            SELECT COALESCE(json_agg(h), '[]')
+            FROM (
+                SELECT trade_id, symbol, action, entry_price, exit_price, lot_size, pnl,
+                       to_char(entry_time, 'YYYY-MM-DD HH24:MI:SS') AS entry_time,
+                       to_char(exit_time, 'YYYY-MM-DD HH24:MI:SS') AS exit_time,
+                       confidence, status,
+                       CASE WHEN pnl > 0 THEN 'green' WHEN pnl < 0 THEN 'red' ELSE 'black' END AS pnl_color
+                FROM trade_history
+                WHERE status = 'closed'
+                ORDER BY trade_history.exit_time DESC
+                LIMIT hist_limit
+            ) h
+        )
+    );
+END;
+$$ LANGUAGE plpgsql STABLE;
+
 -- Create retention policies (keep data for 1 year)
 SELECT add_retention_policy('market_data', INTERVAL '1 year');
 SELECT add_retention_policy('ai_performance', INTERVAL '1 year');
@@ -211,6 +391,21 @@ CREATE TRIGGER update_model_performance_trigger
     FOR EACH ROW
     EXECUTE FUNCTION update_model_performance();
 
+-- Notify listeners once per committed statement that touches trades; the backend
+-- relays this to the dashboard caches (database.relay_trade_changes)
+CREATE OR REPLACE FUNCTION notify_trade_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('trade_events', TG_OP);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trade_change_notify_trigger
+    AFTER INSERT OR UPDATE OR DELETE ON trade_history
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION notify_trade_change();
+
 -- Grant permissions (adjust as needed for your setup)
 GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA public TO trader;
 GRANT ALL PRIVILEGES ON ALL SEQUENCES IN SCHEMA public TO trader;
\ No newline at end of file
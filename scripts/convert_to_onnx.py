@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Offline conversion of trained agent models to ONNX
+
+Usage: python scripts/convert_to_onnx.py [--quantize] <model_path> <n_features> [output_path]
+
+Supports scikit-learn pickles/joblib files (skl2onnx), Keras .h5 (tf2onnx)
+and PyTorch .pt/.pth modules (torch.onnx.export).
+
+--quantize stores MatMul/Gemm weights as int8 (ONNX Runtime dynamic
+quantization). Activations are quantized per batch at inference time, so
+the CPU provider runs integer GEMM kernels (AVX-512 VNNI / ARM SDOT where
+available). Tree ensembles have no such ops and are left unchanged.
+"""
+
+import sys
+from pathlib import Path
+
+
+def convert_sklearn(model_path: Path, n_features: int) -> bytes:
+    """Convert a pickled scikit-learn estimator"""
+    import joblib
+    from skl2onnx import to_onnx
+    import numpy as np
+
+    model = joblib.load(model_path)
+    sample = np.zeros((1, n_features), dtype=np.float32)
+    return to_onnx(model, sample, target_opset=17).SerializeToString()
+
+
+def convert_keras(model_path: Path, n_features: int) -> bytes:
+    """Convert a Keras .h5 model"""
+    import tensorflow as tf
+    import tf2onnx
+
+    model = tf.keras.models.load_model(model_path)
+    spec = (tf.TensorSpec((None, n_features), tf.float32, name="input"),)
+    onnx_model, _ = tf2onnx.convert.from_keras(model, input_signature=spec, opset=17)
+    return onnx_model.SerializeToString()
+
+
+def convert_torch(model_path: Path, n_features: int) -> bytes:
+    """Convert a full PyTorch module"""
+    import io
+    import torch
+
+    model = torch.load(model_path, map_location=torch.device('cpu'))
+    model.eval()
+    buffer = io.BytesIO()
+    torch.onnx.export(
+        model, torch.zeros(1, n_features), buffer,
+        input_names=["input"], output_names=["output"],
+        dynamic_axes={"input": {0: "batch"}, "output": {0: "batch"}},
+        opset_version=17
+    )
+    return buffer.getvalue()
+
+
+def quantize_int8(model_bytes: bytes, output_path: Path):
+    """Write a dynamically int8-quantized copy of an ONNX model"""
+    import tempfile
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fp32_path = Path(tmp) / "model_fp32.onnx"
+        fp32_path.write_bytes(model_bytes)
+        quantize_dynamic(fp32_path, output_path, weight_type=QuantType.QInt8)
+
+
+CONVERTERS = {
+    '.pkl': convert_sklearn,
+    '.pickle': convert_sklearn,
+    '.joblib': convert_sklearn,
+    '.h5': convert_keras,
+    '.pt': convert_torch,
+    '.pth': convert_torch
+}
+
+
+def main():
+    args = sys.argv[1:]
+    quantize = '--quantize' in args
+    if quantize:
+        args.remove('--quantize')
+
+    if len(args) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    model_path = Path(args[0])
+    n_features = int(args[1])
+    output_path = Path(args[2]) if len(args) > 2 else model_path.with_suffix('.onnx')
+
+    converter = CONVERTERS.get(model_path.suffix.lower())
+    if converter is None:
+        print(f"Unsupported model format: {model_path.suffix}")
+        sys.exit(1)
+
+    model_bytes = converter(model_path, n_features)
+    if quantize:
+        quantize_int8(model_bytes, output_path)
+    else:
+        output_path.write_bytes(model_bytes)
+    print(f"Wrote {output_path}")
+
+
+if __name__ == "__main__":
+    main()